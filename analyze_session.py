@@ -1,61 +1,149 @@
 import os
-import json
+import mmap
+import asyncio
+import argparse
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from src.core.lin_parser import LINParser
 from src.core.bridge_math import BridgeMath
-from src.core.ai_orchestrator import AIOrchestrator
+from src.core.ai_orchestrator import get_orchestrator
 from src.core.bridge_solver import BridgeSolver  # <--- NEW IMPORT
+from src.core.async_writer import AsyncArtifactWriter
+from src.utils.logger import setup_logger
 
 # CONFIG
 RAW_DATA_DIR = "data/session_raw"
 RESULTS_DIR = "data/session_results"
+# Max Gemini requests in flight at once (they all share one event loop).
+MAX_CONCURRENCY = int(os.getenv("ANALYZE_WORKERS", "8"))
+# Boards with a results file are skipped on re-runs (only error-free results are saved,
+# so failed boards are retried). Set ANALYZE_FORCE=1 to re-analyze everything.
+SKIP_EXISTING = os.getenv("ANALYZE_FORCE") != "1"
+# Results are machine-read (web_generator); set BRIDGE_PRETTY=1 for indented files.
+PRETTY_JSON = os.getenv("BRIDGE_PRETTY") == "1"
 
-def run_analysis():
-    # Initialize Engines
+def read_lin(file_path):
+    """Reads a .lin file through a read-only mmap (skips the TextIOWrapper buffer copy)."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:].decode("utf-8", "replace")
+
+def prepare_file(filename, file_path, with_dds=True):
+    """
+    CPU stage: read -> parse -> math -> DDS.
+    Runs in a worker process, so it builds its own (stateless) engines.
+    """
     parser = LINParser()
     math_engine = BridgeMath()
-    ai_engine = AIOrchestrator()
     solver = BridgeSolver() # <--- NEW ENGINE
-    
+
+    raw_content = read_lin(file_path)
+
+    # 1. Parse Data
+    hand_data = parser.parse_single_hand(raw_content, filename)
+    deal_id = hand_data.get('board', 'Unknown')
+
+    # 2. Run Math (HCP, distribution)
+    math_results = math_engine.calculate_stats(hand_data)
+
+    # 3. Run Solver (Double Dummy) <--- NEW STEP
+    dds_results = solver.solve(hand_data['hands'], hand_data.get('pbn')) if with_dds else None
+    print(f"Bridge Engine: Analyzed {deal_id} (DDS {'Completed' if with_dds else 'Skipped'})")
+
+    return hand_data, math_results, dds_results
+
+async def process_file(filename, file_path, cpu_pool, ai_sem, ai_engine, writer, with_dds):
+    # The CPU stage is not gated by ai_sem, so DDS solves keep running
+    # on every core while earlier boards are still waiting on Gemini.
+    loop = asyncio.get_running_loop()
+    hand_data, math_results, dds_results = await loop.run_in_executor(cpu_pool, prepare_file, filename, file_path, with_dds)
+    deal_id = hand_data.get('board', 'Unknown')
+
+    # 4. AI Analysis (Now gets dds_results too)
+    async with ai_sem:
+        ai_analysis = await ai_engine.analyze_hand_async(hand_data, math_results, dds_results)
+
+    # A failed call (429, timeout, bad JSON) is not saved: with no results file
+    # the board is picked up again by the next run instead of being skipped forever.
+    if "error" in ai_analysis:
+        print(f"❌ AI analysis failed for {deal_id}: {ai_analysis['error']} (not saved, will retry next run)")
+        return
+
+    # 5. Save Results
+    full_record = {
+        "facts": hand_data,
+        "math": math_results,
+        "dds": dds_results,  # <--- SAVING TRUTH DATA
+        "ai_analysis": ai_analysis,
+        "timestamp": "2025-12-20"
+    }
+    # Handed to the writer thread; this coroutine does not wait for the disk
+    writer.submit(os.path.join(RESULTS_DIR, filename.replace(".lin", ".json")), full_record)
+
+    print(f"✅ Queued analysis for {deal_id}")
+
+async def _run_all(files, ai_engine, writer, workers, with_dds):
+    ai_sem = asyncio.Semaphore(workers)
+    with ProcessPoolExecutor() as cpu_pool:
+        results = await asyncio.gather(
+            *[process_file(name, path, cpu_pool, ai_sem, ai_engine, writer, with_dds) for name, path in files],
+            return_exceptions=True
+        )
+    for (filename, _), result in zip(files, results):
+        if isinstance(result, Exception):
+            print(f"❌ Failed to analyze {filename}: {result}")
+
+def run_analysis(workers=MAX_CONCURRENCY, skip_existing=SKIP_EXISTING, with_dds=True, pretty=PRETTY_JSON):
+    # Non-blocking log sinks: the orchestrator logs on every deal
+    setup_logger()
+
+    # Initialize Engines (parse/math/DDS engines live in the worker processes)
+    ai_engine = get_orchestrator()
+
     # Ensure output directory exists
     os.makedirs(RESULTS_DIR, exist_ok=True)
-    
-    files = [f for f in os.listdir(RAW_DATA_DIR) if f.endswith(".lin")]
-    print(f"Found {len(files)} session files.")
-
-    for filename in files:
-        file_path = os.path.join(RAW_DATA_DIR, filename)
-        
-        with open(file_path, "r", encoding="utf-8") as f:
-            raw_content = f.read()
-            
-        # 1. Parse Data
-        hand_data = parser.parse_single_hand(raw_content, filename)
-        deal_id = hand_data.get('board', 'Unknown')
-        
-        # 2. Run Math (HCP, distribution)
-        math_results = math_engine.calculate_stats(hand_data)
-        
-        # 3. Run Solver (Double Dummy) <--- NEW STEP
-        dds_results = solver.solve(hand_data['hands'])
-        print(f"Bridge Engine: Analyzed {deal_id} (DDS Completed)")
-
-        # 4. AI Analysis (Now gets dds_results too)
-        ai_analysis = ai_engine.analyze_hand(hand_data, math_results, dds_results)
-        
-        # 5. Save Results
-        full_record = {
-            "facts": hand_data,
-            "math": math_results,
-            "dds": dds_results,  # <--- SAVING TRUTH DATA
-            "ai_analysis": ai_analysis,
-            "timestamp": "2025-12-20"
-        }
-        
-        output_filename = filename.replace(".lin", ".json")
-        with open(os.path.join(RESULTS_DIR, output_filename), "w", encoding="utf-8") as out:
-            json.dump(full_record, out, indent=2)
-            
-        print(f"✅ Saved analysis for {deal_id}")
+
+    # One directory scan gives both the name (for skip checks / output) and the
+    # full path (for opening), so nothing is re-joined or re-resolved later.
+    with os.scandir(RAW_DATA_DIR) as it:
+        files = [(e.name, e.path) for e in it if e.name.endswith(".lin") and e.is_file()]
+    print(f"Found {len(files)} session files (concurrency: {workers}).")
+
+    # One directory read instead of a stat() per board
+    if skip_existing:
+        done = set(os.listdir(RESULTS_DIR))
+        pending = [(name, path) for name, path in files if name.replace(".lin", ".json") not in done]
+        if len(pending) < len(files):
+            print(f"Skipping {len(files) - len(pending)} already analyzed files.")
+        files = pending
+
+    writer = AsyncArtifactWriter(json_option=orjson.OPT_INDENT_2 if pretty else 0)
+    try:
+        asyncio.run(_run_all(files, ai_engine, writer, workers, with_dds))
+    finally:
+        writer.flush_and_join()
+        ai_engine.close()
+    print(f"✅ All results written to {RESULTS_DIR}")
+
+def parse_args():
+    arg_parser = argparse.ArgumentParser(description="Analyze every .lin board in the session folder.")
+    arg_parser.add_argument("--workers", type=int, default=MAX_CONCURRENCY,
+                            help="Max Gemini requests in flight (default: ANALYZE_WORKERS or 8)")
+    arg_parser.add_argument("--force", action="store_true",
+                            help="Re-analyze boards that already have a results file")
+    arg_parser.add_argument("--no-dds", action="store_true",
+                            help="Skip the double dummy solver")
+    arg_parser.add_argument("--pretty", action="store_true",
+                            help="Write indented JSON for human inspection")
+    return arg_parser.parse_args()
 
 if __name__ == "__main__":
-    run_analysis()
+    args = parse_args()
+    run_analysis(
+        workers=args.workers,
+        skip_existing=SKIP_EXISTING and not args.force,
+        with_dds=not args.no_dds,
+        pretty=PRETTY_JSON or args.pretty
+    )
@@ -11,7 +11,8 @@ else:
     client = genai.Client(api_key=api_key)
     print("\n--- YOUR AVAILABLE MODELS ---")
     try:
-        for m in client.models.list(config={'page_size': 50}):
+        # Large page size: the whole list comes back in a single request
+        for m in client.models.list(config={'page_size': 1000}):
             # We only care about models that can generate text
             if "generateContent" in m.supported_actions:
                 print(f"Model Name: {m.name}")
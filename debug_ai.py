@@ -1,49 +1,99 @@
 import os
+import sys
+import argparse
 from pathlib import Path
 from dotenv import load_dotenv
-from google import genai
 
-# 1. Load the Environment
-env_path = Path(__file__).resolve().parent / ".env"
-load_dotenv(dotenv_path=env_path)
+# Usage:
+#   python debug_ai.py            -> quick check: fetch the app's 'flash' model directly
+#   python debug_ai.py --verbose  -> step-by-step diagnostic, raw unfiltered model list
 
-api_key = os.getenv("GEMINI_API_KEY")
+# Keep in sync with AI_CONFIG["model_name"] in src/core/ai_orchestrator.py
+MODEL_NAME = "gemini-flash-latest"
 
-print("-" * 40)
-print(f"DEBUG TOOL: Checking Gemini Connection")
-print(f"API Key found: {'Yes' if api_key else 'NO'}")
-print("-" * 40)
+def check_connection(verbose: bool):
+    # 1. Load the Environment
+    env_path = Path(__file__).resolve().parent / ".env"
+    if verbose:
+        print(f"STEP 2: Looking for .env at: {env_path}")
+        print("   -> File found." if env_path.exists() else "   -> CRITICAL: .env file NOT found!")
+    load_dotenv(dotenv_path=env_path)
 
-if not api_key:
-    print("CRITICAL: No API Key found in .env")
-    exit()
+    api_key = os.getenv("GEMINI_API_KEY")
 
-try:
-    # 2. Connect
+    if verbose:
+        if api_key:
+            masked_key = api_key[:4] + "..." + api_key[-4:]
+            print(f"STEP 3: API Key loaded successfully: {masked_key}")
+        else:
+            print("STEP 3: CRITICAL - API Key is None or Empty.")
+    else:
+        print("-" * 40)
+        print(f"DEBUG TOOL: Checking Gemini Connection")
+        print(f"API Key found: {'Yes' if api_key else 'NO'}")
+        print("-" * 40)
+
+    if not api_key:
+        print("CRITICAL: No API Key found in .env")
+        sys.exit(1)
+
+    # 2. Import SDK (Done late so an import crash is visible as its own step)
+    if verbose:
+        print("STEP 4: Importing Google GenAI SDK...")
+    from google import genai
+    if verbose:
+        print("   -> SDK Imported.")
+        print("STEP 5: Initializing Client...")
+
+    # 3. Connect
     client = genai.Client(api_key=api_key)
-    
-    # 3. List Models
-    print("Attempting to list available models...")
+
+    # 4. List Models
+    if verbose:
+        print("   -> Client initialized.")
+        print("STEP 6: Requesting Model List from Google (Network Call)...")
+        # Large page size: the whole list comes back in a single request
+        pager = client.models.list(config={'page_size': 1000})
+        print("\n--- RAW MODEL LIST FROM GOOGLE ---")
+        count = 0
+        for model in pager:
+            count += 1
+            # Print everything found to ensure we aren't filtering too aggressively
+            print(f"FOUND: {model.name}")
+        print(f"\nTotal models found: {count}")
+        print("STEP 7: Diagnostic Finished.")
+        return
+
+    # One lookup of the model we actually use, instead of paging through every model
+    print(f"Attempting to fetch model '{MODEL_NAME}'...")
     print("(This checks if your Key and SDK are working)")
-    
-    # We ask for models that support 'generateContent'
-    pager = client.models.list(config={'page_size': 50})
-    
-    found_flash = False
-    print("\n--- AVAILABLE MODELS ---")
-    for model in pager:
-        # We only care about generation models, not embedding models
-        if "generateContent" in model.supported_generation_methods:
-            print(f" > {model.name}")
-            if "flash" in model.name:
-                found_flash = True
+    model = client.models.get(model=MODEL_NAME)
 
     print("-" * 40)
-    if found_flash:
-        print("SUCCESS: We found 'flash' models. The connection is good.")
+    if "generateContent" in (model.supported_actions or []):
+        print(f" > {model.name}")
+        print("SUCCESS: We found the 'flash' model. The connection is good.")
     else:
-        print("WARNING: Connected, but no 'flash' models found.")
+        print(f"WARNING: Connected, but {model.name} does not support generateContent.")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Check the Gemini API key, SDK and model list.")
+    arg_parser.add_argument("--verbose", action="store_true",
+                            help="Step-by-step diagnostic with the raw, unfiltered model list")
+    args = arg_parser.parse_args()
+
+    if args.verbose:
+        # Force output to print immediately (disable buffering)
+        sys.stdout.reconfigure(line_buffering=True)
+        print("STEP 1: Starting Diagnostic Script...")
 
-except Exception as e:
-    print("\nCONNECTION FAILED!")
-    print(f"Error details: {e}")
\ No newline at end of file
+    try:
+        check_connection(args.verbose)
+    except Exception as e:
+        if args.verbose:
+            print(f"\n!!! CRASH !!!")
+            print(f"Error Type: {type(e).__name__}")
+            print(f"Error Message: {e}")
+        else:
+            print("\nCONNECTION FAILED!")
+            print(f"Error details: {e}")
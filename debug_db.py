@@ -11,19 +11,21 @@ if DB_PATH.exists():
     db = DatabaseManager(DB_PATH)
     db.connect()
     
-    # Check Deals
-    deals = db.connection.execute("SELECT count(*) FROM deals").fetchone()[0]
+    # One statement instead of three round-trips: counts + a sample row
+    deals, sessions, sample_id, sample_dealer = db.connection.execute("""
+        SELECT
+            (SELECT count(*) FROM deals),
+            (SELECT count(*) FROM sessions),
+            (SELECT deal_id FROM deals LIMIT 1),
+            (SELECT dealer FROM deals LIMIT 1)
+    """).fetchone()
     print(f"Rows in 'deals' table:    {deals}")
-    
-    # Check Sessions
-    sessions = db.connection.execute("SELECT count(*) FROM sessions").fetchone()[0]
     print(f"Rows in 'sessions' table: {sessions}")
     
     # Check for specific Data
     if deals > 0:
-        sample = db.connection.execute("SELECT deal_id, dealer FROM deals LIMIT 1").fetchone()
-        print(f"Sample Deal ID:           {sample[0]}")
-        print(f"Sample Dealer:            {sample[1]}")
+        print(f"Sample Deal ID:           {sample_id}")
+        print(f"Sample Dealer:            {sample_dealer}")
     else:
         print(">> THE DATABASE IS EMPTY.")
         
@@ -1,10 +1,10 @@
 import sys
-from PyQt6.QtWidgets import QApplication
 from pathlib import Path
 
 # Local Imports
+# (PyQt6 and the UI are imported inside main(), after the DB check, so a schema
+#  failure doesn't first pay for loading the whole Qt stack.)
 from src.utils.logger import setup_logger
-from src.ui.main_window import MainWindow
 from src.core.database import DatabaseManager 
 from src.utils.paths import DB_PATH
 
@@ -25,6 +25,9 @@ def main():
     db_init.close()
 
     # 3. Launch PyQt App
+    from PyQt6.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow
+
     app = QApplication(sys.argv)
     
     # Apply a clean standard style
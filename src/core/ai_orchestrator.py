@@ -1,114 +1,556 @@
+from __future__ import annotations
+
 import os
-import json
-import re
+import asyncio
+import time
+import shelve
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Final, List, Mapping, Optional, Tuple
+import orjson
 from loguru import logger
-from google import genai
-from google.genai import types
+from src.core.rate_limiter import TokenBucket
+from src.core.prompts import SYSTEM_INSTRUCTION, SYSTEM_INSTRUCTION_PASSOUT, CONTEXT_HEADER, BULK_CONTEXT_HEADER, AnalysisResponse
+
+# The Gemini SDK (and its httpx/auth stack) is only imported once a client is actually
+# built, so importing this module for its helpers or constants stays cheap.
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
 
 # --- CONFIGURATION SECTION ---
 AI_CONFIG = {
     "model_name": "gemini-flash-latest",
     "temperature": 0.3,  # Strict enough for rules, smart enough for judgment
     "response_mime_type": "application/json",
-    "env_file_location": ".env"
+    "request_timeout_ms": 120000,  # Stuck requests must not starve the analyze_session worker pool
+    "requests_per_minute": 60,  # Shared Gemini budget; calls only wait once it is spent
+    "max_concurrency": 50,  # Gemini requests in flight per analyze_hands batch
+    "bulk_size": 10,  # Deals per request in analyze_hands_bulk (keeps each request well inside the context window)
+    "env_file_location": ".env",
+    "cache_location": "data/ai_cache",  # On-disk memo of past answers, keyed by prompt hash
+    "memory_cache_size": 1024  # In-process LRU in front of the disk cache
 }
 
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Load the .env once per process, not once per AIOrchestrator instance
+# (skipped entirely when the key is already in the environment, e.g. set by the shell)
+ENV_PATH = ROOT_DIR / AI_CONFIG["env_file_location"]
+if not os.getenv("GEMINI_API_KEY"):
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=ENV_PATH)
+
+# Contract strain by the character after the level. LIN writes No Trump as "3N",
+# PBN-style sources as "3NT"; alert markers ("1C!") after the strain are ignored.
+_STRAIN_CODES: Final = {'C': 'C', 'D': 'D', 'H': 'H', 'S': 'S', 'N': 'NT'}
+
+# Lowest level that scores game in each strain (Master Rule #1)
+GAME_LEVELS: Final[Mapping[str, int]] = MappingProxyType({"NT": 3, "H": 4, "S": 4, "C": 5, "D": 5})
+SEAT_ORDER = ['North', 'East', 'South', 'West']
+
+# Critique line the red-team scan puts first when it overrides the verdict
+_MISSED_GAME_CRITIQUE: Final[str] = "Red Team: DDS shows {games} makes, but the auction stopped in {contract}."
+
+# Per-deal messages: formatted only if a sink actually takes records at that level
+_LOG = logger.opt(lazy=True)
+
+# Folded into every cache key, so editing the rules invalidates old answers
+_SYSTEM_DIGESTS: Final[Mapping[str, bytes]] = MappingProxyType({
+    text: hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    for text in (SYSTEM_INSTRUCTION, SYSTEM_INSTRUCTION_PASSOUT)
+})
+
+def _requests_per_minute() -> int:
+    """
+    GEMINI_RPM in .env overrides the default budget (e.g. 500 on a paid tier).
+    A non-integer or non-positive value falls back to the default with a warning
+    instead of taking the orchestrator (and the GUI's AI features) down.
+    """
+    default = AI_CONFIG["requests_per_minute"]
+    raw = os.getenv("GEMINI_RPM")
+    if raw is None:
+        return default
+    try:
+        rpm = int(raw)
+    except ValueError:
+        rpm = 0
+    if rpm <= 0:
+        logger.warning(f"Ignoring GEMINI_RPM={raw!r} (expected a positive integer), using {default}")
+        return default
+    return rpm
+
+@functools.lru_cache(maxsize=256)
+def _stable_context_json(dealer: str, vulnerability: str, hands: Tuple) -> bytes:
+    """
+    Serialized dealer / vulnerability / hands part of the CONTEXT DATA.
+    hands is the compact hands frozen as ((seat, ((field, value), ...)), ...) so it can be a cache key.
+    orjson output is already compact: the model doesn't need pretty-printing and every space is billed as input.
+    """
+    return orjson.dumps({
+        "dealer": dealer,
+        "vulnerability": vulnerability,
+        "hands": {seat: dict(fields) for seat, fields in hands}
+    })
+
+@functools.lru_cache(maxsize=1)
+def _get_client(api_key: str) -> genai.Client:
+    """
+    One genai.Client per process: every AIOrchestrator instance shares its
+    HTTP session, so connection pools and TLS sessions survive across instances.
+    """
+    import httpx
+    from google import genai
+    from google.genai import types
+
+    logger.info("*** PRODUCTION MODE: Google GenAI Client Initialized ***")
+    # The async batch path multiplexes every in-flight deal over one HTTP/2
+    # connection instead of paying a TCP/TLS handshake per concurrent request.
+    pool = AI_CONFIG["max_concurrency"]
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            timeout=AI_CONFIG["request_timeout_ms"],
+            async_client_args={
+                "http2": True,
+                "limits": httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+            },
+        )
+    )
+
 class AIOrchestrator:
     
     def __init__(self):
-        env_path = Path(__file__).resolve().parent.parent.parent / AI_CONFIG["env_file_location"]
-        load_dotenv(dotenv_path=env_path)
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("Missing GEMINI_API_KEY")
-        logger.info("*** PRODUCTION MODE: Google GenAI Client Initialized ***")
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = _get_client(self.api_key)
+        cache_path = ROOT_DIR / AI_CONFIG["cache_location"]
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._cache = shelve.open(str(cache_path))
+        self._cache_lock = threading.Lock()
+        self._memo = OrderedDict()  # L1: key -> result, most recently used last
+        self._limiter = TokenBucket(_requests_per_minute())
 
     def analyze_hand(self, hand_data: Dict, math_results: Dict, dds_data: Dict = None) -> Dict:
         deal_id = hand_data.get('board', 'Unknown')
-        logger.info(f"Sending deal {deal_id} to Gemini...")
+        shortcut = self._try_deterministic_verdict(hand_data, math_results, dds_data)
+        if shortcut is not None:
+            _LOG.debug("Deal {} settled by the math, skipping Gemini", lambda: deal_id)
+            return shortcut
 
-        context_payload = {
-            "dealer": hand_data.get('dealer'),
-            "vulnerability": hand_data.get('vulnerability'),
-            "hands": hand_data['hands'],
-            "auction_history": hand_data.get('auction', []),
-            "contract": hand_data.get('contract', 'Pass'),
-            "double_dummy_truth": dds_data
-        }
+        prompt = self._build_prompt(hand_data, dds_data)
+        instruction = self._system_instruction(hand_data)
+        cache_key = self._cache_key(prompt, instruction)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            _LOG.debug("Cache hit for deal {}, skipping Gemini", lambda: deal_id)
+            return cached
 
-        # --- THE "IRONCLAD" PROMPT (v3.0) ---
-        prompt = f"""
-        You are an expert Bridge Teacher (Standard American / SAYC).
-        
-        CONTEXT DATA:
-        {json.dumps(context_payload, indent=2)}
-
-        MASTER RULE #1: THE "GAME HUNTER" MANDATE (Board 6 Fix)
-        - Look at 'double_dummy_truth'. 
-        - If DDS says a Game Contract (3NT, 4H, 4S, 5C, 5D) makes, you CANNOT recommend stopping in a part-score.
-        - If Game is makeable but the players stopped low, Verdict MUST be "MISSED GAME".
-
-        MASTER RULE #2: THE "DUCK" TEST (Board 11 Fix)
-        - **Weak Twos:** If a hand has 6 cards and 6-10 HCP, it is a WEAK TWO (2D/2H/2S). 
-        - Do NOT count "length points" to upgrade this to a 1-opener. Structure beats Valuation.
-        - **Opening Criteria:** 1-level suit opening requires 12+ HCP (or 11 HCP + Rule of 20). Never open 9-10 HCP hands at 1-level.
-
-        MASTER RULE #3: THE GOLDEN FIT (Board 15 Fix)
-        - **Fit Requirement:** Do NOT recommend a final suit contract unless the partnership has a confirmed 8+ card fit.
-        - If DDS shows Spades make (e.g. 3S) and Hearts don't, you MUST find the auction that reaches Spades. 
-        - Do not strand players in a 7-card fit (like 1H) if a better fit exists.
-
-        TASK:
-        Output strict JSON with these specific sections:
-
-        1. VERDICT: "OPTIMAL", "MISSED GAME", "OVERBID", "WRONG OPENER", "WRONG CONTRACT".
-        2. ACTUAL_CRITIQUE: 2-3 bullet points.
-        3. BASIC_SECTION (Standard American):
-           - "analysis": Basic evaluation.
-           - "recommended_auction": LIST of objects {{ "bid": "...", "explanation": "..." }}
-        4. ADVANCED_SECTION (2/1 GF Active):
-           - "analysis": 2/1 logic.
-           - "sequence": LIST of objects {{ "bid": "...", "explanation": "..." }} (Include ALL passes!)
-        5. COACHES_CORNER: List of objects {{ "player": "...", "topic": "...", "category": "..." }}
-
-        OUTPUT JSON FORMAT:
-        {{
-            "verdict": "...",
-            "actual_critique": ["..."],
-            "basic_section": {{
-                "analysis": "...",
-                "recommended_auction": [ {{ "bid": "1D", "explanation": "..." }} ]
-            }},
-            "advanced_section": {{
-                "analysis": "...",
-                "sequence": [ {{ "bid": "...", "explanation": "..." }} ]
-            }},
-            "coaches_corner": []
-        }}
-        """
+        _LOG.debug("Sending deal {} to Gemini...", lambda: deal_id)
 
         try:
-            response = self.client.models.generate_content(
-                model=AI_CONFIG["model_name"], 
+            self._limiter.acquire()
+            # Stream so the body arrives while the model is still generating
+            start = time.perf_counter()
+            chunks = []
+            for chunk in self.client.models.generate_content_stream(
+                model=AI_CONFIG["model_name"],
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type=AI_CONFIG["response_mime_type"],
-                    temperature=AI_CONFIG["temperature"]
-                )
-            )
-            
-            if response.text:
-                return self._red_team_scan(json.loads(response.text), hand_data)
-            else:
-                return {"error": "Empty response"}
+                config=self._generation_config(instruction)
+            ):
+                if chunk.text:
+                    if not chunks:
+                        _LOG.debug("Deal {}: first tokens after {:.2f}s", lambda: deal_id, lambda: time.perf_counter() - start)
+                    chunks.append(chunk.text)
+            result = self._handle_response("".join(chunks), hand_data, dds_data)
+            if "error" not in result:
+                self._cache_put(cache_key, result)
+            return result
 
         except Exception as e:
             logger.error(f"Gemini API Call failed: {e}")
             return {"error": str(e)}
 
-    def _red_team_scan(self, analysis: Dict, facts: Dict) -> Dict:
-        return analysis
\ No newline at end of file
+    async def analyze_hand_async(self, hand_data: Dict, math_results: Dict, dds_data: Dict = None) -> Dict:
+        """Same as analyze_hand, but awaits the non-blocking client so many deals can be in flight."""
+        deal_id = hand_data.get('board', 'Unknown')
+        shortcut = self._try_deterministic_verdict(hand_data, math_results, dds_data)
+        if shortcut is not None:
+            _LOG.debug("Deal {} settled by the math, skipping Gemini", lambda: deal_id)
+            return shortcut
+
+        prompt = self._build_prompt(hand_data, dds_data)
+        instruction = self._system_instruction(hand_data)
+        cache_key = self._cache_key(prompt, instruction)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            _LOG.debug("Cache hit for deal {}, skipping Gemini", lambda: deal_id)
+            return cached
+
+        _LOG.debug("Sending deal {} to Gemini (async)...", lambda: deal_id)
+
+        try:
+            await self._limiter.acquire_async()
+            start = time.perf_counter()
+            chunks = []
+            async for chunk in await self.client.aio.models.generate_content_stream(
+                model=AI_CONFIG["model_name"],
+                contents=prompt,
+                config=self._generation_config(instruction)
+            ):
+                if chunk.text:
+                    if not chunks:
+                        _LOG.debug("Deal {}: first tokens after {:.2f}s", lambda: deal_id, lambda: time.perf_counter() - start)
+                    chunks.append(chunk.text)
+            result = self._handle_response("".join(chunks), hand_data, dds_data)
+            if "error" not in result:
+                # shelve write + sync is blocking disk I/O: keep it off the event loop
+                await asyncio.to_thread(self._cache_put, cache_key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Gemini API Call failed: {e}")
+            return {"error": str(e)}
+
+    def analyze_hands(self, deals: List[Tuple[Dict, Dict, Optional[Dict]]]) -> List[Dict]:
+        """
+        Sync entry point for a batch of (hand_data, math_results, dds_data) tuples.
+        Results come back in input order. Must not be called from a running event loop
+        (async callers should await analyze_hands_batch directly).
+        """
+        return asyncio.run(self.analyze_hands_batch(deals))
+
+    async def analyze_hands_batch(self, deals: List[Tuple[Dict, Dict, Optional[Dict]]]) -> List[Dict]:
+        """Analyzes many deals concurrently, at most AI_CONFIG['max_concurrency'] in flight."""
+        logger.info(f"Batch of {len(deals)} deals submitted to Gemini")
+        sem = asyncio.Semaphore(AI_CONFIG["max_concurrency"])
+        return await asyncio.gather(*[self._analyze_hand_gated(sem, *deal) for deal in deals])
+
+    async def _analyze_hand_gated(self, sem: asyncio.Semaphore, hand_data: Dict, math_results: Dict, dds_data: Dict = None) -> Dict:
+        """analyze_hand_async holding one slot of the caller's concurrency semaphore."""
+        async with sem:
+            return await self.analyze_hand_async(hand_data, math_results, dds_data)
+
+    def analyze_hands_bulk(self, deals: List[Tuple[Dict, Dict, Optional[Dict]]]) -> List[Dict]:
+        """Sync entry point for analyze_hands_bulk_async (same rules as analyze_hands)."""
+        return asyncio.run(self.analyze_hands_bulk_async(deals))
+
+    async def analyze_hands_bulk_async(self, deals: List[Tuple[Dict, Dict, Optional[Dict]]]) -> List[Dict]:
+        """
+        Like analyze_hands_batch, but packs up to AI_CONFIG['bulk_size'] deals into each request,
+        so the system instruction is prefilled once per group instead of once per deal.
+        Groups still run concurrently. Results come back in input order and share the
+        per-deal cache with analyze_hand (a group mixes deal types, so it always uses the
+        full SYSTEM_INSTRUCTION; passed-out deals are cached under that instruction).
+        """
+        results = [None] * len(deals)
+        pending = []  # (index, deal, cache_key, context_json) for every cache miss
+        for i, deal in enumerate(deals):
+            hand_data, math_results, dds_data = deal
+            shortcut = self._try_deterministic_verdict(hand_data, math_results, dds_data)
+            if shortcut is not None:
+                results[i] = shortcut
+                continue
+            context_json = self._context_json(hand_data, dds_data)
+            cache_key = self._cache_key(CONTEXT_HEADER + context_json)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                _LOG.debug("Cache hit for deal {}, skipping Gemini", lambda: hand_data.get('board', 'Unknown'))
+                results[i] = cached
+            else:
+                pending.append((i, deal, cache_key, context_json))
+
+        logger.info(f"Bulk batch of {len(deals)} deals: {len(deals) - len(pending)} answered locally, {len(pending)} sent to Gemini")
+        size = AI_CONFIG["bulk_size"]
+        groups = [pending[n:n + size] for n in range(0, len(pending), size)]
+        sem = asyncio.Semaphore(AI_CONFIG["max_concurrency"])
+        for group, group_results in zip(groups, await asyncio.gather(*[self._analyze_group(g, sem) for g in groups])):
+            for (i, *_), result in zip(group, group_results):
+                results[i] = result
+        return results
+
+    async def _analyze_group(self, group: List[Tuple], sem: asyncio.Semaphore) -> List[Dict]:
+        """One Gemini request for the whole group; falls back to one request per deal if the answer doesn't line up."""
+        analyses = []
+        async with sem:
+            _LOG.debug("Sending {} deals to Gemini in one request...", lambda: len(group))
+            try:
+                await self._limiter.acquire_async()
+                prompt = BULK_CONTEXT_HEADER.format(count=len(group)) + "[" + ",".join(g[3] for g in group) + "]"
+                chunks = []
+                async for chunk in await self.client.aio.models.generate_content_stream(
+                    model=AI_CONFIG["model_name"],
+                    contents=prompt,
+                    config=self._generation_config(SYSTEM_INSTRUCTION, list[AnalysisResponse])
+                ):
+                    if chunk.text:
+                        chunks.append(chunk.text)
+                if chunks:
+                    analyses = orjson.loads("".join(chunks))
+            except Exception as e:
+                logger.error(f"Gemini bulk call failed: {e}")
+
+        if not isinstance(analyses, list) or len(analyses) != len(group):
+            logger.warning(f"Bulk request did not return {len(group)} analyses, retrying deal by deal")
+            # Same semaphore as the groups: a failed group must not exceed max_concurrency
+            return await asyncio.gather(*[self._analyze_hand_gated(sem, *deal) for _, deal, _, _ in group])
+
+        results = self._red_team_scan_batch(analyses, [deal[0] for _, deal, _, _ in group], [deal[2] for _, deal, _, _ in group])
+        # One background write (and one sync) for the whole group
+        await asyncio.to_thread(self._cache_put_many, [(cache_key, result) for (_, _, cache_key, _), result in zip(group, results)])
+        return results
+
+    def _cache_key(self, prompt: str, system_instruction: str = SYSTEM_INSTRUCTION) -> str:
+        """Same model + temperature + instructions + prompt text means the same question: reuse the answer."""
+        digest = hashlib.blake2b(_SYSTEM_DIGESTS[system_instruction] + prompt.encode('utf-8'), digest_size=16).hexdigest()
+        return f"{AI_CONFIG['model_name']}:{AI_CONFIG['temperature']}:{digest}"
+
+    def _cache_get(self, key: str):
+        """
+        L1 (in-process LRU) first, then L2 (shelve on disk).
+        Cached results are shared objects: callers must treat them as read-only.
+        """
+        with self._cache_lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+            result = self._cache.get(key)
+            if result is not None:
+                self._remember(key, result)
+            return result
+
+    def _cache_put(self, key: str, result: Dict):
+        self._cache_put_many([(key, result)])
+
+    def _cache_put_many(self, items: List[Tuple[str, Dict]]):
+        """
+        Stores results in both cache levels. Blocking disk I/O: async callers
+        run it through asyncio.to_thread. No sync per put (dbm.dumb rewrites its
+        whole index on every sync): close() flushes the shelve once at the end.
+        """
+        with self._cache_lock:
+            for key, result in items:
+                self._remember(key, result)
+                self._cache[key] = result
+
+    def close(self):
+        """Flushes and closes the on-disk cache. Safe to call more than once."""
+        with self._cache_lock:
+            self._cache.close()
+        # The next get_orchestrator() call builds a fresh instance with an open cache
+        get_orchestrator.cache_clear()
+
+    def _remember(self, key: str, result: Dict):
+        # Caller holds _cache_lock
+        self._memo[key] = result
+        self._memo.move_to_end(key)
+        if len(self._memo) > AI_CONFIG["memory_cache_size"]:
+            self._memo.popitem(last=False)
+
+    def _generation_config(self, system_instruction: str = SYSTEM_INSTRUCTION, response_schema=AnalysisResponse) -> types.GenerateContentConfig:
+        from google.genai import types  # already loaded by _get_client: a sys.modules lookup
+
+        return types.GenerateContentConfig(
+            system_instruction=system_instruction,
+            response_mime_type=AI_CONFIG["response_mime_type"],
+            response_schema=response_schema,
+            temperature=AI_CONFIG["temperature"]
+        )
+
+    def _try_deterministic_verdict(self, hand_data: Dict, math_results: Dict, dds_data: Dict = None) -> Optional[Dict]:
+        """
+        Answers the deals the rules settle on their own, without a Gemini call.
+        Currently: a pass-out where every hand has 10 HCP or less and no 6-card suit
+        (no 1-level opening on points, no weak two or preempt) and DDS shows no game.
+        Rule of 20 openings with 10 HCP and two 5-card suits are not considered.
+        Returns None for everything else.
+        """
+        if not self._is_passed_out(hand_data) or not math_results or len(math_results) != 4:
+            return None
+
+        for stats in math_results.values():
+            hcp = stats.get('hcp')
+            dist = stats.get('distribution') or ''
+            if hcp is None or hcp > 10 or not dist[:1].isdigit():
+                return None
+            if max(int(n) for n in dist.split('=')) >= 6:
+                return None
+
+        # No DDS table (--no-dds, solver failure): "no game" can't be shown, so let Gemini judge it
+        if not dds_data:
+            return None
+        for strain, level in GAME_LEVELS.items():
+            if any(tricks.get(strain, 0) >= level + 6 for tricks in dds_data.values() if isinstance(tricks, dict)):
+                return None
+
+        dealer = hand_data.get('dealer')
+        start = SEAT_ORDER.index(dealer) if dealer in SEAT_ORDER else 0
+        auction = [
+            {"bid": "Pass", "explanation": f"{seat}: {math_results[seat]['hcp']} HCP and no 6-card suit, nothing to open."}
+            for seat in (SEAT_ORDER[(start + i) % 4] for i in range(4))
+            if seat in math_results
+        ]
+        top_hcp = max(stats['hcp'] for stats in math_results.values())
+        return {
+            "verdict": "OPTIMAL",
+            "actual_critique": [f"Correct pass-out: no hand has opening values (best hand {top_hcp} HCP) or a suit long enough to preempt."],
+            "basic_section": {"analysis": "Nobody meets the opening or weak-two requirements, so passing it out is right.", "recommended_auction": auction},
+            "advanced_section": {"analysis": "2/1 changes nothing here: there is no opening bid to respond to.", "sequence": auction},
+            "coaches_corner": []
+        }
+
+    @staticmethod
+    def _is_passed_out(hand_data: Dict) -> bool:
+        """
+        True only for a recorded auction that ended in four passes (contract 'Pass').
+        A deal without a contract (BridgeParser imports) or without an auction is unknown, not passed out.
+        """
+        return hand_data.get('contract') == 'Pass' and bool(hand_data.get('auction'))
+
+    @staticmethod
+    def _system_instruction(hand_data: Dict) -> str:
+        """Passed-out deals get the shorter instruction; everything else the full rule set."""
+        if AIOrchestrator._is_passed_out(hand_data):
+            return SYSTEM_INSTRUCTION_PASSOUT
+        return SYSTEM_INSTRUCTION
+
+    def _handle_response(self, response_text: str, hand_data: Dict, dds_data: Dict = None) -> Dict:
+        if response_text:
+            return self._red_team_scan(orjson.loads(response_text), hand_data, dds_data)
+        return {"error": "Empty response"}
+
+    def _build_prompt(self, hand_data: Dict, dds_data: Dict = None) -> str:
+        return CONTEXT_HEADER + self._context_json(hand_data, dds_data)
+
+    def _context_json(self, hand_data: Dict, dds_data: Dict = None) -> str:
+        # The deal itself (dealer, vulnerability, hands) is serialized once and reused when the
+        # same deal comes back with a different auction or DDS table (what-if runs, re-analysis).
+        hands = tuple((seat, tuple(fields.items())) for seat, fields in self._compact_hands(hand_data['hands']).items())
+        stable = _stable_context_json(hand_data.get('dealer'), hand_data.get('vulnerability'), hands)
+        volatile = orjson.dumps({
+            "auction_history": hand_data.get('auction', []),
+            "contract": hand_data.get('contract', 'Pass'),
+            "double_dummy_truth": dds_data
+        })
+
+        # Same bytes as dumping the whole payload at once, so cache keys are unchanged
+        return (stable[:-1] + b',' + volatile[1:]).decode()
+
+    def _compact_hands(self, hands: Dict) -> Dict:
+        """
+        Shrinks each seat to one PBN card string plus the pre-computed math, e.g.
+        {"name": "bobj245", "cards": "AKQ32.54.KJ9.Q82", "hcp": 12, "total_points": 13, "dist": "5=2=3=3"}.
+        Fewer tokens per request than the nested parser structure.
+        Accepts both LINParser hands ({'stats': {'cards': {...}}}) and BridgeParser hands (['AK', 'QJ', 'T9', '87']).
+        """
+        compact = {}
+        for seat, hand in hands.items():
+            if isinstance(hand, dict):
+                stats = hand.get('stats', {})
+                cards = stats.get('cards', {})
+                compact[seat] = {
+                    "name": hand.get('name', seat),
+                    "cards": ".".join(cards.get(s, '') for s in 'SHDC'),
+                    "hcp": stats.get('hcp'),
+                    "total_points": stats.get('total_points'),
+                    "dist": stats.get('distribution_str')
+                }
+            else:
+                compact[seat] = {"cards": ".".join(hand)}
+        return compact
+
+    def _red_team_scan(self, analysis: Dict, facts: Dict, dds_data: Dict = None) -> Dict:
+        """
+        Zero-trust check of the AI verdict against the DDS truth.
+        If the auction stopped in a part-score but DDS says the declaring side
+        makes a game, the verdict is forced to "MISSED GAME" (Master Rule #1).
+        A validator never raises: on malformed input the analysis comes back untouched.
+        """
+        return self._red_team_scan_batch([analysis], [facts], [dds_data])[0]
+
+    def _red_team_scan_batch(self, analyses: List[Dict], facts_list: List[Dict], dds_list: List[Optional[Dict]]) -> List[Dict]:
+        """_red_team_scan over a whole group of results in one pass; each result is checked independently."""
+        check = self._red_team_check
+        scanned = []
+        for analysis, facts, dds_data in zip(analyses, facts_list, dds_list):
+            try:
+                scanned.append(check(analysis, facts, dds_data))
+            except (KeyError, TypeError, AttributeError) as e:
+                # Python unbinds `e` when the except block ends; the lazy lambda needs its own name
+                err = e
+                _LOG.warning("Red Team scan skipped on {}: {}", lambda: facts.get('board', 'Unknown'), lambda: err)
+                scanned.append(analysis)
+        return scanned
+
+    def _red_team_check(self, analysis: Dict, facts: Dict, dds_data: Dict = None) -> Dict:
+        if not dds_data or not isinstance(analysis, dict):
+            return analysis
+
+        contract = facts.get('contract') or 'Pass'
+        parsed = self._parse_contract(contract)
+        if not parsed:
+            return analysis
+
+        level, strain = parsed
+        if level >= GAME_LEVELS.get(strain, 99):
+            return analysis
+
+        side = self._declaring_side(facts)
+        if not side:
+            return analysis
+
+        # Look up each declaring seat's DDS row once, not once per strain
+        side_tricks = [dds_data.get(seat) or {} for seat in side]
+        makeable_games = [
+            f"{game_level}{game_strain}"
+            for game_strain, game_level in GAME_LEVELS.items()
+            if any(tricks.get(game_strain, 0) >= game_level + 6 for tricks in side_tricks)
+        ]
+
+        verdict = analysis.get('verdict') or ''
+        if makeable_games and verdict != "MISSED GAME":
+            _LOG.warning("Red Team override on {}: {} -> MISSED GAME", lambda: facts.get('board', 'Unknown'), lambda: verdict)
+            analysis['verdict'] = "MISSED GAME"
+            critique = analysis.get('actual_critique') or []
+            if not isinstance(critique, list):
+                critique = [critique]
+            # One new list with the override first (no insert-at-0 memmove)
+            analysis['actual_critique'] = [_MISSED_GAME_CRITIQUE.format(games=', '.join(makeable_games), contract=contract), *critique]
+
+        return analysis
+
+    @staticmethod
+    def _parse_contract(bid: str) -> Optional[Tuple[int, str]]:
+        """'4S' -> (4, 'S'), '3N' / '3NT' -> (3, 'NT'); None for Pass, X, XX or junk."""
+        if len(bid) < 2 or not '1' <= bid[0] <= '7':
+            return None
+        strain = _STRAIN_CODES.get(bid[1].upper())
+        if strain is None:
+            return None
+        return ord(bid[0]) - 48, strain
+
+    def _declaring_side(self, facts: Dict) -> List[str]:
+        """Returns the DDS seat keys (e.g. ['N', 'S']) of the side that bid the final contract."""
+        dealer = facts.get('dealer')
+        if dealer not in SEAT_ORDER:
+            return []
+
+        dealer_idx = SEAT_ORDER.index(dealer)
+        for i, bid in reversed(list(enumerate(facts.get('auction', [])))):
+            if self._parse_contract(bid):
+                seat = SEAT_ORDER[(dealer_idx + i) % 4]
+                return ['N', 'S'] if seat in ['North', 'South'] else ['E', 'W']
+        return []
+
+@functools.lru_cache(maxsize=1)
+def get_orchestrator() -> AIOrchestrator:
+    """
+    Process-wide AIOrchestrator, so every caller shares one genai.Client
+    (and its connection pool) instead of paying SDK init + TLS setup again.
+    """
+    return AIOrchestrator()
@@ -0,0 +1,42 @@
+import queue
+import threading
+from pathlib import Path
+import orjson
+from loguru import logger
+
+class AsyncArtifactWriter:
+    """
+    Writes result JSON files from a single background thread.
+    Producers call submit() and move straight on to the next deal;
+    serialization and disk I/O happen off the critical path.
+    """
+
+    _STOP = object()
+
+    def __init__(self, json_option: int = 0):
+        # 0 = orjson's compact output; pass orjson.OPT_INDENT_2 for human-readable files
+        self.json_option = json_option
+        self.q = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, obj):
+        """Queues obj to be written to path as JSON."""
+        self.q.put((Path(path), obj))
+
+    def flush_and_join(self):
+        """Blocks until every queued record is on disk, then stops the thread."""
+        self.q.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self.q.get()
+            if item is self._STOP:
+                break
+            path, obj = item
+            try:
+                # Serialize once, single write
+                path.write_bytes(orjson.dumps(obj, option=self.json_option))
+            except Exception as e:
+                logger.error(f"Failed to write {path}: {e}")
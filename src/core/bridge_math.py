@@ -1,4 +1,11 @@
-from typing import Dict
+import functools
+from typing import Dict, Final, FrozenSet, List, Tuple
+
+# Standard balanced shapes (sorted): 4-3-3-3, 4-4-3-2, 5-3-3-2
+BALANCED_SHAPES: Final[FrozenSet[Tuple[int, ...]]] = frozenset({(4, 3, 3, 3), (4, 4, 3, 2), (5, 3, 3, 2)})
+
+# HCP of every byte value (A=4, K=3, Q=2, J=1, anything else 0), for bytes.translate
+HCP_LUT: Final[bytes] = bytes({ord('A'): 4, ord('K'): 3, ord('Q'): 2, ord('J'): 1}.get(i, 0) for i in range(256))
 
 class BridgeMath:
     """
@@ -30,24 +37,41 @@ class BridgeMath:
             
         return results
 
-    def _check_balanced(self, dist_str: str) -> bool:
+    @staticmethod
+    def calculate_hcp(hand: List[str]) -> int:
+        """
+        HCP of a hand given as suit strings (['AKQ', 'T9', ...], as BridgeParser stores it).
+        translate + sum run in C over the whole hand: no per-card dict lookup.
+        """
+        return sum("".join(hand).upper().encode('ascii', 'ignore').translate(HCP_LUT))
+
+    @staticmethod
+    def evaluate_hand(hand: List[str]) -> Dict:
+        """
+        Per-hand math for a BridgeParser hand (four suit strings, S/H/D/C),
+        in the shape DatabaseManager.save_deal stores.
+        """
+        hcp = BridgeMath.calculate_hcp(hand)
+        lengths = [len(suit) for suit in hand]
+        return {
+            "hcp": hcp,
+            # HCP + 1 length point for every card over 4 in a suit (same valuation as LINParser)
+            "total_opener": hcp + sum(n - 4 for n in lengths if n > 4),
+            "distribution": "=".join(map(str, lengths))
+        }
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _check_balanced(dist_str: str) -> bool:
         """
         Returns True if the hand is 4-3-3-3, 4-4-3-2, or 5-3-3-2.
         Input format example: "5=3=3=2"
+        Memoized: there are only 39 possible shapes, so almost every call is a cache hit.
         """
         try:
-            # Parse "5=3=3=2" into [5, 3, 3, 2]
-            counts = [int(x) for x in dist_str.split('=')]
-            counts.sort(reverse=True) # Sort to compare against standard shapes
+            # Parse "5=3=3=2" into (5, 3, 3, 2), sorted to compare against standard shapes
+            counts = tuple(sorted((int(x) for x in dist_str.split('=')), reverse=True))
+            return counts in BALANCED_SHAPES
             
-            # Standard balanced shapes (sorted)
-            # 4-3-3-3 -> [4, 3, 3, 3]
-            # 4-4-3-2 -> [4, 4, 3, 2]
-            # 5-3-3-2 -> [5, 3, 3, 2]
-            
-            if counts in [[4,3,3,3], [4,4,3,2], [5,3,3,2]]:
-                return True
+        except (ValueError, AttributeError):
             return False
-            
-        except:
-            return False
\ No newline at end of file
@@ -1,60 +1,100 @@
+import os
 import json
-from endplay.types import Deal
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from endplay.types import Deal, Denom
 from endplay.dds import calc_dd_table
 
+# Solved tables per process, keyed by the canonical "N:..." PBN deal string.
+# The same deal comes back often (open and closed room, re-runs of a session),
+# and a cache hit skips the double-dummy solver entirely.
+DD_CACHE_SIZE = 4096
+
+# Result strain key -> its calc_dd_table row. Rows follow endplay's Denom order
+# (S, H, D, C, NT), not the C, D, H, S, NT order the results are written in.
+DD_STRAIN_ROWS = (("C", Denom.clubs), ("D", Denom.diamonds), ("H", Denom.hearts), ("S", Denom.spades), ("NT", Denom.nt))
+
+@functools.lru_cache(maxsize=DD_CACHE_SIZE)
+def _dd_table(pbn_string: str) -> tuple:
+    """calc_dd_table as immutable rows: 5 strains in endplay's Denom order (S, H, D, C, NT) x 4 seats (N, E, S, W)."""
+    return tuple(tuple(row) for row in calc_dd_table(Deal(pbn_string)).to_list())
+
+def _clean_suit(cards_str):
+    if not cards_str: return ""
+    return cards_str.replace("10", "T").replace(" ", "")
+
+def _solve_chunk(hands_chunk):
+    """Worker-process entry point for solve_many (module level so it pickles)."""
+    solver = BridgeSolver()
+    return [solver.solve(hands_data) for hands_data in hands_chunk]
+
 class BridgeSolver:
-    def solve(self, hands_data):
-        pbn_string = "Unknown"
+    @staticmethod
+    def clear_cache():
+        """Drops every cached double-dummy table."""
+        _dd_table.cache_clear()
+
+    def solve_many(self, hands_list, workers=None, max_chunk=64):
+        """
+        Solves many deals across worker processes (DDS is CPU-bound, one core per solve).
+        Deals go out in chunks of at most max_chunk to amortize pickling; results come back in input order.
+        Callers on Windows must run this under an `if __name__ == "__main__":` guard (spawn start method).
+        """
+        workers = workers or os.cpu_count() or 1
+        chunk_size = max(1, min(max_chunk, -(-len(hands_list) // workers)))
+        chunks = [hands_list[i:i + chunk_size] for i in range(0, len(hands_list), chunk_size)]
+        if len(chunks) <= 1:
+            return [self.solve(hands_data) for hands_data in hands_list]
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            return [result for chunk in pool.map(_solve_chunk, chunks) for result in chunk]
+
+    def solve(self, hands_data, pbn=None):
+        """
+        Double-dummy table for one deal. pbn is the deal's "N:..." string when the parser
+        already built it (LINParser's 'pbn' field); otherwise it is assembled from hands_data.
+        """
+        pbn_string = pbn or "Unknown"
         try:
-            # 1. Convert JSON hands to PBN string format
-            pbn_parts = []
-            order = ['North', 'East', 'South', 'West']
-            total_cards = 0
-            
-            for seat in order:
-                hand = hands_data.get(seat, {}).get('stats', {}).get('cards', {})
-                
-                def clean_suit(cards_str):
-                    if not cards_str: return ""
-                    return cards_str.replace("10", "T").replace(" ", "")
-
-                s = clean_suit(hand.get('S', ''))
-                h = clean_suit(hand.get('H', ''))
-                d = clean_suit(hand.get('D', ''))
-                c = clean_suit(hand.get('C', ''))
-                
-                total_cards += len(s) + len(h) + len(d) + len(c)
-                pbn_parts.append(f"{s}.{h}.{d}.{c}")
-            
-            pbn_string = "N:" + " ".join(pbn_parts)
+            if pbn:
+                # "N:" + 3 seat separators + 12 suit dots around the 52 cards
+                total_cards = len(pbn) - 17
+            else:
+                # 1. Convert JSON hands to PBN string format
+                pbn_parts = []
+                order = ['North', 'East', 'South', 'West']
+                total_cards = 0
+
+                for seat in order:
+                    hand = hands_data.get(seat, {}).get('stats', {}).get('cards', {})
+
+                    s = _clean_suit(hand.get('S', ''))
+                    h = _clean_suit(hand.get('H', ''))
+                    d = _clean_suit(hand.get('D', ''))
+                    c = _clean_suit(hand.get('C', ''))
+
+                    total_cards += len(s) + len(h) + len(d) + len(c)
+                    pbn_parts.append(f"{s}.{h}.{d}.{c}")
+
+                pbn_string = "N:" + " ".join(pbn_parts)
             
             if total_cards != 52:
                 print(f"⚠️ DDS Skip: Deck has {total_cards} cards. PBN: {pbn_string}")
                 return None
 
-            # 2. Solve
-            deal = Deal(pbn_string)
-            table = calc_dd_table(deal)
-            
-            # 3. Escape Hatch: Convert to List
+            # 2. Solve (or reuse the table of an identical deal)
             # raw_data structure is 5 rows (Suits) x 4 columns (Players)
-            raw_data = table.to_list()
+            raw_data = _dd_table(pbn_string)
             
             results = {"N": {}, "S": {}, "E": {}, "W": {}}
-            strains = ["C", "D", "H", "S", "NT"]
             
-            for i, strain in enumerate(strains):
-                row = raw_data[i]
-                
-                # CORRECTED MAPPING (NESW Standard)
-                # 0 = North
-                # 1 = East  <-- This index belongs to East
-                # 2 = South <-- This index belongs to South
-                # 3 = West
+            for strain, denom in DD_STRAIN_ROWS:
+                row = raw_data[denom]
                 
+                # Columns are seats in NESW order (endplay's Player enum)
                 results['N'][strain] = row[0]
-                results['E'][strain] = row[1] # Fixed: Index 1 is East
-                results['S'][strain] = row[2] # Fixed: Index 2 is South
+                results['E'][strain] = row[1]
+                results['S'][strain] = row[2]
                 results['W'][strain] = row[3]
                 
             return results
@@ -1,27 +1,80 @@
 import sqlite3
-import json
+import orjson
 import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from loguru import logger
 
+# Insert statements shared by every save: one SQL text, so sqlite3's statement
+# cache compiles each exactly once per connection.
+INSERT_DEAL_SQL = """
+    INSERT OR IGNORE INTO deals (
+        deal_id, dealer, vulnerability, 
+        hands_json, handviewer_url,
+        hcp_north, dist_points_north,
+        hcp_south, dist_points_south,
+        hcp_east, dist_points_east,
+        hcp_west, dist_points_west
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_SESSION_SQL = """
+    INSERT INTO sessions (
+        source_file, board_id, players_json, auction_json, deal_id_fk
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+RECORD_IMPORT_SQL = "INSERT OR REPLACE INTO file_cache (path, mtime_ns, size, deal_ids_json) VALUES (?, ?, ?, ?)"
+
+# Columns the deals grid displays (iter_deals' default projection)
+DEAL_GRID_COLUMNS = ('deal_id', 'dealer', 'vulnerability', 'hcp_north', 'hcp_south', 'hcp_east', 'hcp_west')
+
+# Seat order of the hcp_* / dist_points_* column pairs in INSERT_DEAL_SQL
+MATH_COLUMN_ORDER = ('North', 'South', 'East', 'West')
+
 class DatabaseManager:
     """
     Manages the SQLite database for BridgeMaster.
     Handles schema creation and atomic transactions.
     """
 
+    # Seat order of the canonical string behind deal_id
+    DEAL_HASH_ORDER = ('North', 'East', 'South', 'West')
+
+    # (name, DDL) of every index besides the primary keys
+    SECONDARY_INDEXES = (
+        ("idx_sessions_deal", "CREATE INDEX IF NOT EXISTS idx_sessions_deal ON sessions(deal_id_fk)"),
+        ("idx_analyses_deal", "CREATE INDEX IF NOT EXISTS idx_analyses_deal ON analyses(deal_id_fk)"),
+        # HCP filters / sorts in the UI become index range scans
+        ("idx_deals_hcp_n", "CREATE INDEX IF NOT EXISTS idx_deals_hcp_n ON deals(hcp_north)"),
+        ("idx_deals_hcp_s", "CREATE INDEX IF NOT EXISTS idx_deals_hcp_s ON deals(hcp_south)"),
+        ("idx_deals_hcp_e", "CREATE INDEX IF NOT EXISTS idx_deals_hcp_e ON deals(hcp_east)"),
+        ("idx_deals_hcp_w", "CREATE INDEX IF NOT EXISTS idx_deals_hcp_w ON deals(hcp_west)"),
+    )
+
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.connection = None
 
     def connect(self):
-        """Establishes connection and enables Foreign Keys."""
+        """
+        Establishes connection and enables Foreign Keys.
+        
+        Ingest tuning: WAL journal with synchronous=NORMAL means one fsync per
+        checkpoint instead of two per commit, and lets the UI keep reading while an
+        import writes. NORMAL is safe against application crashes; only the last
+        transaction(s) can be lost on power failure, and an import can simply be re-run.
+        The connection is in autocommit mode (isolation_level=None): writers open
+        their own BEGIN/COMMIT, so a batch is exactly one transaction.
+        """
         try:
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
-            self.connection = sqlite3.connect(self.db_path)
+            self.connection = sqlite3.connect(self.db_path, isolation_level=None)
             # Critical: SQLite does not enforce FKs by default. We must enable it.
             self.connection.execute("PRAGMA foreign_keys = ON")
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self.connection.execute("PRAGMA temp_store = MEMORY")
+            self.connection.execute("PRAGMA cache_size = -65536")  # 64 MB page cache
             self.connection.row_factory = sqlite3.Row # Access columns by name
             logger.info(f"Connected to database: {self.db_path}")
         except Exception as e:
@@ -34,7 +87,12 @@ class DatabaseManager:
             logger.info("Database connection closed.")
 
     def init_schema(self):
-        """Creates the Tables if they do not exist."""
+        """Creates the Tables and their indexes if they do not exist (cheap on an existing DB: no ANALYZE)."""
+        self.init_schema_tables()
+        self.create_indexes(analyze=False)
+
+    def init_schema_tables(self):
+        """Creates the Tables (primary keys only) if they do not exist."""
         if not self.connection:
             self.connect()
 
@@ -102,21 +160,50 @@ class DatabaseManager:
             )
         """)
 
+        # 4. TABLE: FILE_CACHE (Incremental re-import)
+        # Files whose size and mtime are unchanged since their last import are skipped.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS file_cache (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER,
+                size INTEGER,
+                deal_ids_json TEXT -- deal_ids the file produced
+            )
+        """)
+
         self.connection.commit()
         logger.info("Database schema initialized.")
 
+    def create_indexes(self, analyze: bool = True):
+        """
+        Creates the secondary indexes. Bulk imports call this after loading
+        (see drop_indexes), so rows are not indexed one at a time during the insert.
+        analyze: refresh planner statistics afterwards (a full scan; only worth it after a rebuild).
+        """
+        if not self.connection:
+            self.connect()
+        for _, ddl in self.SECONDARY_INDEXES:
+            self.connection.execute(ddl)
+        if analyze:
+            self.connection.execute("ANALYZE")
+
+    def drop_indexes(self):
+        """Drops the secondary indexes before a large import; create_indexes() puts them back."""
+        if not self.connection:
+            self.connect()
+        for name, _ in self.SECONDARY_INDEXES:
+            self.connection.execute(f"DROP INDEX IF EXISTS {name}")
+
     def _generate_deal_hash(self, hands_dict: Dict) -> str:
         """
         Creates a unique ID based on the cards. 
         Ensures if the same hand is imported twice, we don't duplicate it.
         """
-        # Canonical string: N:Cards,E:Cards,S:Cards,W:Cards
-        # Sort keys to ensure consistent order
-        canonical = ""
-        for direction in ['North', 'East', 'South', 'West']:
-             # Flatten the list of suits ['AK', 'Q'] -> "AKQ"
-             cards = "".join(hands_dict.get(direction, []))
-             canonical += f"{direction}:{cards}|"
+        # Canonical string: North:Cards|East:Cards|South:Cards|West:Cards|
+        # Fixed seat order; each hand's suit list ['AK', 'Q'] is flattened to "AKQ".
+        # Built in one join (no += re-allocation per seat). SHA-256 is kept on purpose:
+        # deal_id is stored, and a different hash would duplicate every re-imported deal.
+        canonical = "".join(f"{direction}:{''.join(hands_dict.get(direction, []))}|" for direction in self.DEAL_HASH_ORDER)
         
         return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
 
@@ -132,65 +219,114 @@ class DatabaseManager:
         Returns:
             The deal_id (hash) of the saved hand.
         """
+        return self.save_deals_bulk([(parsed_hand, math_results, handviewer_url)])[0]
+
+    def save_deals_bulk(self, items: List[Tuple[Dict, Dict[str, Dict], str]],
+                        source: Optional[Tuple[Path, Tuple[int, int]]] = None) -> List[str]:
+        """
+        Inserts many deals in one transaction (one commit instead of one per hand);
+        save_deal is this with a single item. Same rules as save_deal: deals are INSERT OR IGNORE, every occurrence gets a session row.
+        
+        Args:
+            items: (parsed_hand, math_results, handviewer_url) tuples, as for save_deal.
+            source: (file_path, signature) of the file the deals came from. Its file_cache row
+                is written in the same transaction, so a file is never marked imported without its deals.
+        
+        Returns:
+            The deal_ids, in input order.
+        """
         if not self.connection:
             self.connect()
-            
-        deal_id = self._generate_deal_hash(parsed_hand['hands'])
-        
-        try:
-            # 1. Insert into DEALS (Ignore if exists)
-            
-            # Helper to safely get math values
-            def get_m(direction, key):
-                return math_results.get(direction, {}).get(key, 0)
-
-            self.connection.execute("""
-                INSERT OR IGNORE INTO deals (
-                    deal_id, dealer, vulnerability, 
-                    hands_json, handviewer_url,
-                    hcp_north, dist_points_north,
-                    hcp_south, dist_points_south,
-                    hcp_east, dist_points_east,
-                    hcp_west, dist_points_west
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+
+        deal_ids = []
+        deal_rows = []
+        session_rows = []
+        for parsed_hand, math_results, handviewer_url in items:
+            deal_id = self._generate_deal_hash(parsed_hand['hands'])
+            deal_ids.append(deal_id)
+
+            deal_rows.append((
                 deal_id,
                 parsed_hand.get('dealer', 'N'),
                 parsed_hand.get('vulnerability', 'None'),
-                json.dumps(parsed_hand['hands']),
+                orjson.dumps(parsed_hand['hands']).decode(),
                 handviewer_url,
-                
-                get_m('North', 'hcp'), get_m('North', 'total_opener'),
-                get_m('South', 'hcp'), get_m('South', 'total_opener'),
-                get_m('East', 'hcp'),  get_m('East', 'total_opener'),
-                get_m('West', 'hcp'),  get_m('West', 'total_opener')
+                # hcp / total_opener per seat, in column order (missing values -> 0)
+                *(value
+                  for m in (math_results.get(direction) or {} for direction in MATH_COLUMN_ORDER)
+                  for value in (m.get('hcp', 0), m.get('total_opener', 0)))
             ))
-
-            # 2. Insert into SESSIONS (Always insert, as it's a new occurrence)
-            self.connection.execute("""
-                INSERT INTO sessions (
-                    source_file, board_id, players_json, auction_json, deal_id_fk
-                ) VALUES (?, ?, ?, ?, ?)
-            """, (
+            session_rows.append((
                 parsed_hand.get('source_file', 'unknown'),
                 parsed_hand.get('board_id', ''),
-                json.dumps(parsed_hand.get('players', {})),
-                json.dumps(parsed_hand.get('auction', [])),
+                orjson.dumps(parsed_hand.get('players', {})).decode(),
+                orjson.dumps(parsed_hand.get('auction', [])).decode(),
                 deal_id
             ))
-            
-            self.connection.commit()
-            return deal_id
+
+        try:
+            # The context manager commits on success and rolls back on any exception.
+            # BEGIN IMMEDIATE takes the write lock up front instead of upgrading mid-batch.
+            with self.connection:
+                self.connection.execute("BEGIN IMMEDIATE")
+
+                # 1. Insert into DEALS (Ignore if exists)
+                self.connection.executemany(INSERT_DEAL_SQL, deal_rows)
+
+                # 2. Insert into SESSIONS (Always insert, as it's a new occurrence)
+                self.connection.executemany(INSERT_SESSION_SQL, session_rows)
+
+                # 3. Mark the source file as imported (see is_imported)
+                if source is not None:
+                    self.connection.execute(RECORD_IMPORT_SQL, self._file_cache_row(*source, deal_ids))
+            return deal_ids
 
         except sqlite3.Error as e:
-            logger.error(f"Failed to save deal {deal_id}: {e}")
-            self.connection.rollback()
+            logger.error(f"Failed to save {len(deal_rows)} deals: {e}")
             raise
 
+    @staticmethod
+    def file_signature(file_path: Path) -> Tuple[int, int]:
+        """(mtime_ns, size) of a source file: cheap change detection without reading it."""
+        st = file_path.stat()
+        return st.st_mtime_ns, st.st_size
+
+    def is_imported(self, file_path: Path, signature: Tuple[int, int]) -> bool:
+        """True if file_path was already imported with exactly this signature."""
+        if not self.connection:
+            self.connect()
+        row = self.connection.execute(
+            "SELECT mtime_ns, size FROM file_cache WHERE path = ?", (str(file_path.resolve()),)
+        ).fetchone()
+        return row is not None and (row['mtime_ns'], row['size']) == signature
+
+    def record_import(self, file_path: Path, signature: Tuple[int, int], deal_ids: List[str]):
+        """Remembers that file_path (at this signature) has been imported (imports use save_deals_bulk(source=...))."""
+        if not self.connection:
+            self.connect()
+        self.connection.execute(RECORD_IMPORT_SQL, self._file_cache_row(file_path, signature, deal_ids))
+
+    @staticmethod
+    def _file_cache_row(file_path: Path, signature: Tuple[int, int], deal_ids: List[str]) -> Tuple:
+        return (str(file_path.resolve()), *signature, orjson.dumps(deal_ids).decode())
+
+    def iter_deals(self, cols: Optional[Tuple[str, ...]] = DEAL_GRID_COLUMNS,
+                   limit: Optional[int] = None, offset: int = 0) -> Iterator[sqlite3.Row]:
+        """
+        Streams deals row by row (one page with limit/offset), reading only the requested columns.
+        The default projection is what the grid shows: no hands_json blob per row.
+        cols=None selects every column.
+        """
+        if not self.connection:
+            self.connect()
+        projection = ", ".join(cols) if cols else "*"
+        yield from self.connection.execute(
+            f"SELECT {projection} FROM deals LIMIT ? OFFSET ?", (limit if limit is not None else -1, offset)
+        )
+
     def get_all_deals(self) -> List[Dict]:
-        """Fetches all deals for the UI grid."""
-        cursor = self.connection.execute("SELECT * FROM deals")
-        return [dict(row) for row in cursor.fetchall()]
+        """Fetches all deals (every column), e.g. for a full export."""
+        return [dict(row) for row in self.iter_deals(cols=None)]
 
 if __name__ == "__main__":
     # Quick Test
@@ -0,0 +1,71 @@
+from typing import Dict, Tuple
+
+SUITS = 'SHDC'
+RANKS = '23456789TJQKA'
+
+# Every 13-card suit-length tuple (S, H, D, C) -> "5=3=3=2"; there are only 560 of them,
+# so the display string is a dict lookup instead of map(str) + join per hand
+DISTRIBUTION_STR: Dict[Tuple[int, int, int, int], str] = {
+    (s, h, d, 13 - s - h - d): f"{s}={h}={d}={13 - s - h - d}"
+    for s in range(14) for h in range(14 - s) for d in range(14 - s - h)
+}
+
+class HandBits:
+    """
+    52-bit bitboard representation of a Bridge hand (one bit per card).
+    Bit index = suit_index * 13 + rank_index, suits in S, H, D, C order, ranks 2..A.
+    HCP and suit lengths become popcounts on masked ints instead of per-card loops.
+    """
+
+    # (suit, rank) -> single-bit mask
+    CARD_BIT = {(s, r): 1 << (si * 13 + ri) for si, s in enumerate(SUITS) for ri, r in enumerate(RANKS)}
+
+    # All 52 cards: XOR with the known hands leaves the missing one
+    FULL_DECK = (1 << 52) - 1
+
+    # One 13-bit mask per suit
+    SUIT_MASKS = tuple(0x1FFF << (si * 13) for si in range(4))
+
+    # Per suit, (rank, bit) from Ace down to 2: to_suits reads cards off in display order
+    SUIT_RANKS_DESC = tuple(tuple((r, 1 << (si * 13 + ri)) for ri, r in reversed(list(enumerate(RANKS)))) for si in range(4))
+
+    # All four cards of a given rank
+    ACES = sum(1 << (si * 13 + 12) for si in range(4))
+    KINGS = sum(1 << (si * 13 + 11) for si in range(4))
+    QUEENS = sum(1 << (si * 13 + 10) for si in range(4))
+    JACKS = sum(1 << (si * 13 + 9) for si in range(4))
+
+    @staticmethod
+    def from_lin(hand: str) -> int:
+        """LIN hand 'SAKQHT9D...C...' -> bitboard, in one pass (text before the first suit letter is ignored)."""
+        card_bit = HandBits.CARD_BIT
+        bits = 0
+        current_suit = ''
+        for char in hand:
+            if char in SUITS:
+                current_suit = char
+            else:
+                bits |= card_bit.get((current_suit, char), 0)
+        return bits
+
+    @staticmethod
+    def to_suits(bits: int) -> Dict[str, str]:
+        """Bitboard -> {'S': 'AKQ', 'H': 'T9', ...}, ranks already sorted high to low."""
+        return {s: "".join(r for r, bit in ranks if bits & bit) for s, ranks in zip(SUITS, HandBits.SUIT_RANKS_DESC)}
+
+    @staticmethod
+    def hcp(bits: int) -> int:
+        return (4 * (bits & HandBits.ACES).bit_count()
+                + 3 * (bits & HandBits.KINGS).bit_count()
+                + 2 * (bits & HandBits.QUEENS).bit_count()
+                + (bits & HandBits.JACKS).bit_count())
+
+    @staticmethod
+    def suit_lengths(bits: int) -> Tuple[int, int, int, int]:
+        """Lengths in S, H, D, C order."""
+        return tuple((bits & mask).bit_count() for mask in HandBits.SUIT_MASKS)
+
+    @staticmethod
+    def distribution_str(lengths: Tuple[int, ...]) -> str:
+        """(5, 3, 3, 2) -> "5=3=3=2" (table lookup; incomplete hands fall back to join)."""
+        return DISTRIBUTION_STR.get(lengths) or "=".join(map(str, lengths))
@@ -1,100 +1,131 @@
 import re
-from typing import Dict, List, Set
+from typing import Dict, List, Tuple
+from src.core.hand_bits import HandBits
+
+# LIN is a flat stream of "tag|value|" pairs: one compiled pattern walks the whole record once.
+_TAG_RE = re.compile(r'(\w\w)\|([^|]*)\|')
 
 class LINParser:
     """
     Parses LIN files, infers missing hands, and calculates Bridge stats.
     """
     
-    # Standard Bridge Order for sorting
-    CARD_RANKS = {'A': 14, 'K': 13, 'Q': 12, 'J': 11, 'T': 10, '9': 9, '8': 8, '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2}
     SUITS = ['S', 'H', 'D', 'C']
 
+    # LIN code tables
+    DEALER_MAP = {'1': 'South', '2': 'West', '3': 'North', '4': 'East'}
+    VULN_MAP = {'o': 'None', 'n': 'N/S', 'e': 'E/W', 'b': 'Both'}
+    # BBO 'md|1...' implies order: South, West, North, East
+    SEAT_ORDER = ("South", "West", "North", "East")
+    NON_CONTRACT_BIDS = frozenset(['p', 'pass', 'd', 'dbl', 'r', 'rdbl', 'an'])
+
     def parse_single_hand(self, raw_lin_data: str, filename: str = "Unknown") -> Dict:
+        tags = self._tokenize(raw_lin_data)
+
         board_name = filename.replace('_', ' ').replace('.lin', '')
-        ah_match = re.search(r'ah\|([^|]+)\|', raw_lin_data)
-        if ah_match:
-            board_name = ah_match.group(1).strip()
+        if tags.get('ah'):
+            board_name = tags['ah'][0].strip()
 
         # Parse Hands
-        hands_dict = self._parse_hands(raw_lin_data)
+        hands_dict = self._parse_hands(tags)
 
         data = {
             "board": board_name,
-            "dealer": self._get_dealer(raw_lin_data),
-            "vulnerability": self._get_vuln(raw_lin_data),
-            "contract": self._get_contract(raw_lin_data),
-            "auction": self._parse_auction(raw_lin_data),
-            "play": self._parse_play(raw_lin_data),
+            "dealer": self._get_dealer(tags),
+            "vulnerability": self._get_vuln(tags),
+            "contract": self._get_contract(tags),
+            "auction": self._parse_auction(tags),
+            "play": self._parse_play(tags),
             "hands": hands_dict,
+            "pbn": self._to_pbn(hands_dict),
             "raw_lin": raw_lin_data
         }
         return data
 
-    def _get_dealer(self, lin: str) -> str:
-        match = re.search(r'md\|([1-4])', lin)
-        if match:
-            map_dealer = {'1': 'South', '2': 'West', '3': 'North', '4': 'East'}
-            return map_dealer.get(match.group(1), 'Unknown')
+    def _to_pbn(self, hands: Dict) -> str:
+        """
+        The deal as one PBN string, "N:S.H.D.C E... S... W...", built once here from the sorted suits
+        so the DDS solver can use it directly instead of re-assembling it from the hands dict.
+        """
+        return "N:" + " ".join(
+            ".".join(hands.get(seat, {}).get('stats', {}).get('cards', {}).get(s, '') for s in self.SUITS)
+            for seat in ('North', 'East', 'South', 'West')
+        )
+
+    def _tokenize(self, lin: str) -> Dict[str, List[str]]:
+        """Single pass over the record: tag -> list of its non-empty values, in order."""
+        tags = {}
+        for tag, value in _TAG_RE.findall(lin):
+            if value:
+                tags.setdefault(tag, []).append(value)
+        return tags
+
+    def _deal_value(self, tags: Dict[str, List[str]]) -> str:
+        """First 'md' value that starts with a dealer digit, e.g. '3S8QH56...'."""
+        for value in tags.get('md', []):
+            if value[0] in self.DEALER_MAP:
+                return value
+        return ''
+
+    def _get_dealer(self, tags: Dict[str, List[str]]) -> str:
+        deal = self._deal_value(tags)
+        if deal:
+            return self.DEALER_MAP[deal[0]]
         return 'Unknown'
 
-    def _get_vuln(self, lin: str) -> str:
-        match = re.search(r'sv\|([oneb])', lin)
-        if match:
-            map_vuln = {'o': 'None', 'n': 'N/S', 'e': 'E/W', 'b': 'Both'}
-            return map_vuln.get(match.group(1), 'None')
+    def _get_vuln(self, tags: Dict[str, List[str]]) -> str:
+        for value in tags.get('sv', []):
+            if value[0] in self.VULN_MAP:
+                return self.VULN_MAP[value[0]]
         return 'None'
     
-    def _get_contract(self, lin: str) -> str:
-        bids = re.findall(r'mb\|([^|]+)\|', lin)
-        valid_bids = [b for b in bids if b.lower() not in ['p', 'pass', 'd', 'dbl', 'r', 'rdbl', 'an']]
+    def _get_contract(self, tags: Dict[str, List[str]]) -> str:
+        valid_bids = [b for b in tags.get('mb', []) if b.lower() not in self.NON_CONTRACT_BIDS]
         return valid_bids[-1] if valid_bids else "Pass"
 
-    def _parse_auction(self, lin: str) -> List[str]:
-        raw_bids = re.findall(r'mb\|([^|]+)\|', lin)
-        return [b for b in raw_bids if b != 'an']
+    def _parse_auction(self, tags: Dict[str, List[str]]) -> List[str]:
+        return [b for b in tags.get('mb', []) if b != 'an']
 
-    def _parse_play(self, lin: str) -> List[str]:
-        return re.findall(r'pc\|([^|]+)\|', lin)
+    def _parse_play(self, tags: Dict[str, List[str]]) -> List[str]:
+        return list(tags.get('pc', []))
 
-    def _parse_hands(self, lin: str) -> Dict:
-        # Extract the 'md' tag
-        match = re.search(r'md\|[1-4]([^|]+)\|', lin)
-        if not match:
+    def _parse_hands(self, tags: Dict[str, List[str]]) -> Dict:
+        # Extract the 'md' tag (dealer digit + hands)
+        deal = self._deal_value(tags)
+        if len(deal) < 2:
             return {}
 
         # Split hands. Note: Last comma might be missing or trailing.
         # Format: S...H...D...C..., S...H... etc
-        raw_hands_list = [h for h in match.group(1).split(',') if h]
+        raw_hands_list = [h for h in deal[1:].split(',') if h]
 
         parsed_hands = {}
         
         # 1. Parse the known hands (South, West, North)
-        # BBO 'md|1...' implies order: South, West, North, East
-        seat_order = ["South", "West", "North", "East"]
+        seat_order = self.SEAT_ORDER
         
-        known_cards = set()
+        known_bits = 0
 
         for i in range(len(raw_hands_list)):
             seat = seat_order[i]
-            hand_obj = self._parse_single_hand_string(raw_hands_list[i])
-            parsed_hands[seat] = hand_obj
+            # One pass over the characters: every card goes straight into the bitboard.
+            # Sorted suit strings, HCP and lengths are then read off the bits
+            # (no per-suit sort, no second walk over the cards).
+            bits = HandBits.from_lin(raw_hands_list[i])
+            parsed_hands[seat] = {"stats": self._stats_from_bits(bits)}
             
             # Track all known cards to infer the 4th hand later
-            for s in self.SUITS:
-                for rank in hand_obj['stats']['cards'][s]:
-                    known_cards.add(s + rank)
+            known_bits |= bits
 
         # 2. Check for missing East (or any missing hand)
         if len(parsed_hands) < 4:
             missing_seat = seat_order[len(parsed_hands)] # Usually East
-            inferred_hand = self._infer_missing_hand(known_cards)
+            inferred_hand = self._infer_missing_hand(known_bits)
             parsed_hands[missing_seat] = inferred_hand
 
         # 3. Add Player Names
-        name_match = re.search(r'pn\|([^|]+)\|', lin)
-        if name_match:
-            names = name_match.group(1).split(',')
+        if tags.get('pn'):
+            names = tags['pn'][0].split(',')
             for i, seat in enumerate(seat_order):
                 if seat in parsed_hands and i < len(names):
                     parsed_hands[seat]["name"] = names[i]
@@ -103,85 +134,33 @@ class LINParser:
 
         return parsed_hands
 
-    def _parse_single_hand_string(self, h_str: str) -> Dict:
-        suits = {'S': [], 'H': [], 'D': [], 'C': []}
-        current_suit = ''
-        
-        # Parse characters
-        for char in h_str:
-            if char in suits:
-                current_suit = char
-            else:
-                suits[current_suit].append(char)
-        
-        # Sort suits High to Low (A -> 2)
-        for s in suits:
-            suits[s].sort(key=lambda x: self.CARD_RANKS.get(x, 0), reverse=True)
-            # Rejoin list to string for display
-            suits[s] = "".join(suits[s])
-
-        # Calculate Stats
-        hcp = self._calculate_hcp(suits)
-        total_points = self._calculate_total_points(suits, hcp)
-        dist_str = f"{len(suits['S'])}={len(suits['H'])}={len(suits['D'])}={len(suits['C'])}"
-
+    def _infer_missing_hand(self, known_bits: int) -> Dict:
+        # Whatever the known hands don't hold: one XOR against the full deck
         return {
-            "stats": {
-                "cards": suits, 
-                "hcp": hcp, 
-                "total_points": total_points,
-                "distribution_str": dist_str
-            }
+            "name": "East", # Default
+            "stats": self._stats_from_bits(HandBits.FULL_DECK ^ known_bits)
         }
 
-    def _infer_missing_hand(self, known_cards: Set[str]) -> Dict:
-        # Create full deck
-        full_deck = set()
-        for s in self.SUITS:
-            for r in self.CARD_RANKS.keys():
-                full_deck.add(s + r)
-        
-        # Subtract known
-        missing_cards_set = full_deck - known_cards
-        
-        # Build structure
-        suits = {'S': [], 'H': [], 'D': [], 'C': []}
-        for card in missing_cards_set:
-            suit = card[0]
-            rank = card[1]
-            suits[suit].append(rank)
-            
-        # Sort
-        for s in suits:
-            suits[s].sort(key=lambda x: self.CARD_RANKS.get(x, 0), reverse=True)
-            suits[s] = "".join(suits[s])
-            
-        hcp = self._calculate_hcp(suits)
-        total_points = self._calculate_total_points(suits, hcp)
-        dist_str = f"{len(suits['S'])}={len(suits['H'])}={len(suits['D'])}={len(suits['C'])}"
+    def _stats_from_bits(self, bits: int) -> Dict:
+        # One bitboard per hand: HCP and suit lengths are popcounts on it
+        hcp = self._calculate_hcp(bits)
+        lengths = HandBits.suit_lengths(bits)
 
         return {
-            "name": "East", # Default
-            "stats": {
-                "cards": suits, 
-                "hcp": hcp, 
-                "total_points": total_points,
-                "distribution_str": dist_str
-            }
+            "cards": HandBits.to_suits(bits),
+            "hcp": hcp,
+            "total_points": self._calculate_total_points(lengths, hcp),
+            "distribution_str": HandBits.distribution_str(lengths)
         }
 
-    def _calculate_hcp(self, suits: Dict) -> int:
-        hcp = 0
-        for s in suits.values():
-            for card in s:
-                hcp += self.CARD_RANKS.get(card, 0) - 10 if self.CARD_RANKS.get(card, 0) > 10 else 0
-        return hcp
+    def _calculate_hcp(self, bits: int) -> int:
+        return HandBits.hcp(bits)
 
-    def _calculate_total_points(self, suits: Dict, hcp: int) -> int:
+    def _calculate_total_points(self, lengths: Tuple[int, ...], hcp: int) -> int:
         # Standard Valuation: HCP + Length Points
         # Add 1 point for every card over 4 in a suit
         length_points = 0
-        for s in suits.values():
-            if len(s) > 4:
-                length_points += (len(s) - 4)
-        return hcp + length_points
\ No newline at end of file
+        for n in lengths:
+            if n > 4:
+                length_points += (n - 4)
+        return hcp + length_points
@@ -1,8 +1,12 @@
 import re
+import functools
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import Iterable, Iterator, List, Dict, Optional, Set, Tuple
 from loguru import logger
+from src.core.hand_bits import HandBits
 
 class BridgeParser:
     """
@@ -12,15 +16,34 @@ class BridgeParser:
     # Map LIN dealer numbers to Compass directions
     LIN_DEALER_MAP = {'1': 'S', '2': 'W', '3': 'N', '4': 'E'}
     
-    # Standard 52 card deck for validation/deduction
-    FULL_DECK = set([
-        f"{r}{s}" for s in "SHDC" for r in "23456789TJQKA"
-    ])
+    # PBN deal order: seats clockwise from the dealer letter
+    PBN_SEATS = {
+        'N': ('North', 'East', 'South', 'West'),
+        'E': ('East', 'South', 'West', 'North'),
+        'S': ('South', 'West', 'North', 'East'),
+        'W': ('West', 'North', 'East', 'South'),
+    }
+
+    # Vulnerability by (board number - 1) % 16
+    VUL_PATTERN = (
+        "None", "NS", "EW", "All",
+        "NS", "EW", "All", "None",
+        "EW", "All", "None", "NS",
+        "All", "None", "NS", "EW"
+    )
+
+    # Compiled once at import instead of going through re's pattern cache on every segment
+    _RE_BOARD_ID = re.compile(r'([oc]\d+)')
+    # One scan per segment picks up every tag we read (players, deal, bids)
+    _RE_TAGS = re.compile(r'(pn|md|mb)\|([^|]*)\|')
+    _RE_NUMBER = re.compile(r'\d+')
+    _RE_PBN_DEAL = re.compile(r'\[Deal "(N|S|E|W):([^"]+)"\]')
 
     @staticmethod
-    def parse_file(file_path: Path) -> List[Dict]:
+    def parse_file(file_path: Path, content: Optional[str] = None) -> List[Dict]:
         """
         Auto-detects file type and dispatches to the correct parser.
+        content: the file's text if the caller already read it (see parse_files).
         """
         file_path = Path(file_path)
         if not file_path.exists():
@@ -29,37 +52,67 @@ class BridgeParser:
 
         suffix = file_path.suffix.lower()
         if suffix == '.lin':
-            return BridgeParser.parse_lin(file_path)
+            return BridgeParser.parse_lin(file_path, content)
         elif suffix == '.pbn':
-            return BridgeParser.parse_pbn(file_path)
+            return BridgeParser.parse_pbn(file_path, content)
         else:
             logger.warning(f"Unsupported file format: {suffix}")
             return []
 
     @staticmethod
-    def parse_lin(file_path: Path) -> List[Dict]:
+    def parse_files(file_paths: Iterable[Path], workers: int = 8) -> Iterator[Tuple[Path, List[Dict]]]:
+        """
+        Parses many files, yielding (path, deals) in input order.
+        The reads run on a thread pool so the many small file reads overlap;
+        parsing itself stays on the calling thread. At most 2 * workers reads are
+        in flight, so only a small window of file texts is held in memory.
+        """
+        window = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path in map(Path, file_paths):
+                window.append((path, pool.submit(BridgeParser._read_text, path)))
+                if len(window) >= 2 * workers:
+                    done_path, future = window.popleft()
+                    yield done_path, BridgeParser.parse_file(done_path, future.result())
+            while window:
+                done_path, future = window.popleft()
+                yield done_path, BridgeParser.parse_file(done_path, future.result())
+
+    @staticmethod
+    def _read_text(file_path: Path) -> Optional[str]:
+        """File text, or None if it can't be read (the parser then reports the error)."""
+        try:
+            return file_path.read_text(encoding='utf-8')
+        except Exception:
+            return None
+
+    @staticmethod
+    def parse_lin(file_path: Path, content: Optional[str] = None) -> List[Dict]:
         """
         Parses a Bridge Base Online .lin file.
         Handling: Extracts 'md' (Make Deal), 'qx' (Board ID), 'pn' (Players).
         Logic: LIN hands are often S,W,N (East implied). We calculate East.
         """
         hands_data = []
-        try:
-            content = file_path.read_text(encoding='utf-8')
-        except Exception as e:
-            logger.error(f"Failed to read LIN file {file_path}: {e}")
-            return []
+        if content is None:
+            try:
+                content = file_path.read_text(encoding='utf-8')
+            except Exception as e:
+                logger.error(f"Failed to read LIN file {file_path}: {e}")
+                return []
 
         # Split file into "lines" (LIN files are pipe-delimited records)
         # We assume a new board usually starts with 'qx|' (Board ID) or is a separate line
         # Simple approach: Split by 'qx|' which marks a new board in Vugraph files
-        segments = content.split('qx|')
+        separator = 'qx|'
         
         # If no qx tags, try splitting by newline if it's a bulk export
-        if len(segments) < 2 and '\n' in content:
-            segments = content.split('\n')
+        if separator not in content and '\n' in content:
+            separator = '\n'
 
-        for segment in segments:
+        # Segments are sliced off one at a time, so a large Vugraph file
+        # never holds a list of every board alongside its text
+        for segment in BridgeParser._iter_segments(content, separator):
             if 'md|' not in segment:
                 continue
 
@@ -67,34 +120,36 @@ class BridgeParser:
                 # Extract Board ID (o1 = open room board 1, c1 = closed room)
                 board_id = "Unknown"
                 if segment.startswith('o') or segment.startswith('c'):
-                     board_id = re.match(r'([oc]\d+)', segment).group(1)
+                     board_id = BridgeParser._RE_BOARD_ID.match(segment).group(1)
+
+                # Single pass over the segment: tag -> values, in order
+                tags = {'pn': [], 'md': [], 'mb': []}
+                for tag, value in BridgeParser._RE_TAGS.findall(segment):
+                    if value:
+                        tags[tag].append(value)
 
                 # Extract Players 'pn|South,West,North,East|'
                 players = ["Unknown"] * 4
-                pn_match = re.search(r'pn\|([^|]+)\|', segment)
-                if pn_match:
-                    p_str = pn_match.group(1).split(',')
+                if tags['pn']:
+                    p_str = tags['pn'][0].split(',')
                     players = [p.strip() for p in p_str] + ["Unknown"] * (4 - len(p_str))
 
                 # Extract Deal 'md|3SA...|'
                 # Format: md|DealerDigits(1-4)SouthHand,WestHand,NorthHand|
-                md_match = re.search(r'md\|([1-4])([^|]+)\|', segment)
-                if not md_match:
+                deal_value = next((v for v in tags['md'] if len(v) > 1 and v[0] in '1234'), None)
+                if not deal_value:
                     continue
 
-                dealer_num = md_match.group(1)
-                cards_str = md_match.group(2)
+                dealer_num = deal_value[0]
+                cards_str = deal_value[1:]
                 
                 deal_dict = BridgeParser._process_lin_hands(dealer_num, cards_str)
                 
                 # Extract Auction (bidding)
                 # LIN auction is usually 'mb|1N|mb|P|...'
-                auction = []
-                bids = re.findall(r'mb\|([^|]+)\|', segment)
                 # Cleanup: remove alerts 'an|...' and explanations
                 # For now, just simplistic capture of bids
-                for bid in bids:
-                    auction.append(bid)
+                auction = list(tags['mb'])
 
                 # Construct Final Object
                 hand_record = {
@@ -119,6 +174,18 @@ class BridgeParser:
         logger.info(f"Parsed {len(hands_data)} hands from {file_path.name}")
         return hands_data
 
+    @staticmethod
+    def _iter_segments(content: str, separator: str) -> Iterator[str]:
+        """Lazy content.split(separator): yields the same pieces, in order."""
+        start = 0
+        while True:
+            end = content.find(separator, start)
+            if end == -1:
+                yield content[start:]
+                return
+            yield content[start:end]
+            start = end + len(separator)
+
     @staticmethod
     def _process_lin_hands(dealer_digit: str, cards_str: str) -> Dict[str, List[str]]:
         """
@@ -136,115 +203,64 @@ class BridgeParser:
         parsed_hands = {}
         directions = ['South', 'West', 'North'] # LIN order
         
-        used_cards = set()
+        used_bits = 0
 
         for idx, raw_hand in enumerate(raw_hands):
             if idx >= 3: break # Should only be S, W, N
             
-            # Extract suits using Regex. 
+            # Extract suits in one scan (shared with LINParser).
             # Note: LIN uses S, H, D, C as delimiters. 
             # Example: SAJTH432... -> Spades: AJT, Hearts: 432...
-            
-            # Helper to extract specific suit holdings
-            def get_suit(suit_char, text):
-                pattern = f"{suit_char}([^SHDC]*)"
-                match = re.search(pattern, text)
-                if match:
-                    return match.group(1)
-                return ""
-
-            # Standardize LIN sometimes omitting the first 'S' if it's implicit? 
-            # Safer to ensure capital letters.
-            raw_hand = raw_hand.upper()
-            
-            # If the string doesn't start with a suit letter, it's messy. 
-            # Assuming standard BBO LIN export for now.
-            
-            spades = get_suit('S', raw_hand)
-            hearts = get_suit('H', raw_hand)
-            diamonds = get_suit('D', raw_hand)
-            clubs = get_suit('C', raw_hand)
-            
-            # Store full cards for Used List (e.g., "SA", "SK") to calculate East
-            for r in spades: used_cards.add(f"S{r}")
-            for r in hearts: used_cards.add(f"H{r}")
-            for r in diamonds: used_cards.add(f"D{r}")
-            for r in clubs: used_cards.add(f"C{r}")
-
-            parsed_hands[directions[idx]] = [spades, hearts, diamonds, clubs]
+            # LIN is uppercase by spec; only a hand with lowercase letters pays for .upper()
+            if not raw_hand.isupper():
+                raw_hand = raw_hand.upper()
+            hand_bits = HandBits.from_lin(raw_hand)
 
-        # Calculate East (The missing cards)
-        remaining = BridgeParser.FULL_DECK - used_cards
-        e_spades, e_hearts, e_diamonds, e_clubs = [], [], [], []
-        
-        for card in remaining:
-            suit, rank = card[0], card[1]
-            if suit == 'S': e_spades.append(rank)
-            elif suit == 'H': e_hearts.append(rank)
-            elif suit == 'D': e_diamonds.append(rank)
-            elif suit == 'C': e_clubs.append(rank)
+            # Mark every card in the used bitboard to calculate East
+            used_bits |= hand_bits
 
-        # Sort ranks (high to low) for consistency (AKQ...)
-        rank_order = "AKQJT98765432"
-        def sort_hand(cards):
-            return sorted(cards, key=lambda x: rank_order.index(x) if x in rank_order else 99)
+            # Read back off the bits: ranks come out sorted high to low (AKQ...)
+            hand = HandBits.to_suits(hand_bits)
+            parsed_hands[directions[idx]] = [hand['S'], hand['H'], hand['D'], hand['C']]
 
-        parsed_hands['East'] = [
-            "".join(sort_hand(e_spades)),
-            "".join(sort_hand(e_hearts)),
-            "".join(sort_hand(e_diamonds)),
-            "".join(sort_hand(e_clubs))
-        ]
-        
-        # Ensure S, W, N are also sorted
-        for d in directions:
-            if d in parsed_hands:
-                h = parsed_hands[d]
-                parsed_hands[d] = ["".join(sort_hand(s)) for s in h]
+        # Calculate East (The missing cards): one XOR, suits come back sorted high to low
+        east = HandBits.to_suits(HandBits.FULL_DECK ^ used_bits)
+        parsed_hands['East'] = [east['S'], east['H'], east['D'], east['C']]
 
         return parsed_hands
 
     @staticmethod
+    @functools.lru_cache(maxsize=128)
     def _determine_vul(board_id_str: str) -> str:
         """
         Simple heuristic to guess vulnerability from board number.
         Standard Bridge Pattern:
         1: None, 2: NS, 3: EW, 4: All
         5: NS, 6: EW, 7: All, 8: None ...
+        Cached: a file only ever has a handful of distinct board ids.
         """
-        try:
-            # Extract number from "o1", "12", "Board 1"
-            num_match = re.search(r'\d+', board_id_str)
-            if not num_match: return "None"
-            
-            bn = int(num_match.group(0))
-            mod = (bn - 1) % 16
-            
-            vul_pattern = [
-                "None", "NS", "EW", "All",
-                "NS", "EW", "All", "None",
-                "EW", "All", "None", "NS",
-                "All", "None", "NS", "EW"
-            ]
-            return vul_pattern[mod]
-        except:
-            return "None"
+        # Extract number from "o1", "12", "Board 1"
+        num_match = BridgeParser._RE_NUMBER.search(board_id_str or "")
+        if not num_match: return "None"
+
+        return BridgeParser.VUL_PATTERN[(int(num_match.group(0)) - 1) % 16]
 
     @staticmethod
-    def parse_pbn(file_path: Path) -> List[Dict]:
+    def parse_pbn(file_path: Path, content: Optional[str] = None) -> List[Dict]:
         """
         Basic PBN parser. Looks for [Deal "N:shdc..."] tags.
         """
         # NOTE: This is a simplified implementation. 
         # Robust PBN parsing is complex; this handles the standard 'Deal' tag.
-        try:
-            content = file_path.read_text(encoding='utf-8')
-        except:
-            return []
+        if content is None:
+            try:
+                content = file_path.read_text(encoding='utf-8')
+            except:
+                return []
             
         deals = []
         # Regex to find Deal tags: [Deal "N:AK.Q.J.T ..."]
-        matches = re.finditer(r'\[Deal "(N|S|E|W):([^"]+)"\]', content)
+        matches = BridgeParser._RE_PBN_DEAL.finditer(content)
         
         for m in matches:
             dealer_char = m.group(1)
@@ -253,17 +269,11 @@ class BridgeParser:
             # PBN hands are space separated. Order is clockwise from dealer.
             hand_strings = hands_str.split(' ')
             
-            compass = ['N', 'E', 'S', 'W']
-            start_idx = compass.index(dealer_char)
-            
             deal_dict = {}
-            for i, h_str in enumerate(hand_strings):
-                if i >= 4: break
-                direction = compass[(start_idx + i) % 4]
+            # zip stops after the 4th hand
+            for dir_name, h_str in zip(BridgeParser.PBN_SEATS[dealer_char], hand_strings):
                 # PBN suits are dot separated: S.H.D.C
                 suits = h_str.split('.')
-                # Convert to full names
-                dir_name = {'N':'North', 'S':'South', 'E':'East', 'W':'West'}[direction]
                 deal_dict[dir_name] = suits if len(suits) == 4 else [[],[],[],[]]
 
             deals.append({
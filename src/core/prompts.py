@@ -0,0 +1,107 @@
+from enum import Enum
+from typing import Final, List
+from pydantic import BaseModel
+
+# --- THE "IRONCLAD" PROMPT (v3.0) ---
+# Built once at import. The static rules go in system_instruction, so every request
+# shares the same prefix (eligible for Gemini's implicit prompt caching) and only
+# the CONTEXT DATA block changes per deal.
+_PREAMBLE = """You are an expert Bridge Teacher (Standard American / SAYC).
+The user message contains the CONTEXT DATA for one deal.
+Each hand's "cards" is a PBN string: Spades.Hearts.Diamonds.Clubs (e.g. "AKQ32.54.KJ9.Q82"; T = 10).
+"""
+
+_RULE_GAME_HUNTER = """
+MASTER RULE #1: THE "GAME HUNTER" MANDATE (Board 6 Fix)
+- Look at 'double_dummy_truth'. 
+- If DDS says a Game Contract (3NT, 4H, 4S, 5C, 5D) makes, you CANNOT recommend stopping in a part-score.
+- If Game is makeable but the players stopped low, Verdict MUST be "MISSED GAME".
+"""
+
+_RULE_DUCK_TEST = """
+MASTER RULE #2: THE "DUCK" TEST (Board 11 Fix)
+- **Weak Twos:** If a hand has 6 cards and 6-10 HCP, it is a WEAK TWO (2D/2H/2S). 
+- Do NOT count "length points" to upgrade this to a 1-opener. Structure beats Valuation.
+- **Opening Criteria:** 1-level suit opening requires 12+ HCP (or 11 HCP + Rule of 20). Never open 9-10 HCP hands at 1-level.
+"""
+
+_RULE_GOLDEN_FIT = """
+MASTER RULE #3: THE GOLDEN FIT (Board 15 Fix)
+- **Fit Requirement:** Do NOT recommend a final suit contract unless the partnership has a confirmed 8+ card fit.
+- If DDS shows Spades make (e.g. 3S) and Hearts don't, you MUST find the auction that reaches Spades. 
+- Do not strand players in a 7-card fit (like 1H) if a better fit exists.
+"""
+
+# Passed-out deals: no contract was played, so only the fit requirement is relevant
+# to the recommended auction; the rest of Rule #3 is about a contract that doesn't exist.
+_RULE_GOLDEN_FIT_PASSOUT = """
+MASTER RULE #3: THE GOLDEN FIT
+- **Fit Requirement:** Do NOT recommend a final suit contract unless the partnership has a confirmed 8+ card fit.
+"""
+
+_TASK = """
+TASK:
+Fill in the response schema (it is enforced for you) with these sections:
+
+1. VERDICT: "OPTIMAL", "MISSED GAME", "OVERBID", "WRONG OPENER", "WRONG CONTRACT".
+2. ACTUAL_CRITIQUE: 2-3 bullet points.
+3. BASIC_SECTION (Standard American):
+   - "analysis": Basic evaluation.
+   - "recommended_auction": each bid with its explanation.
+4. ADVANCED_SECTION (2/1 GF Active):
+   - "analysis": 2/1 logic.
+   - "sequence": each bid with its explanation (Include ALL passes!)
+5. COACHES_CORNER: teaching points, each with player, topic and category.
+"""
+
+SYSTEM_INSTRUCTION: Final[str] = _PREAMBLE + _RULE_GAME_HUNTER + _RULE_DUCK_TEST + _RULE_GOLDEN_FIT + _TASK
+
+# Shorter variant for deals that were passed out (contract "Pass"). Each variant is
+# still a fixed string, so requests of the same kind keep sharing a cacheable prefix.
+SYSTEM_INSTRUCTION_PASSOUT: Final[str] = (
+    _PREAMBLE
+    + "The deal was passed out: judge whether anyone should have opened.\n"
+    + _RULE_GAME_HUNTER + _RULE_DUCK_TEST + _RULE_GOLDEN_FIT_PASSOUT + _TASK
+)
+
+CONTEXT_HEADER: Final[str] = "CONTEXT DATA:\n"
+
+# Bulk requests (analyze_hands_bulk): same rules, several deals per message
+BULK_CONTEXT_HEADER: Final[str] = (
+    "CONTEXT DATA for {count} deals, as a JSON array.\n"
+    "Analyze each deal on its own and return exactly {count} analyses, in the same order.\n"
+)
+
+# --- RESPONSE SCHEMA ---
+# Passed as response_schema, so Gemini is forced to return exactly this shape
+# (no JSON skeleton in the prompt, no malformed output to defend against).
+class Verdict(str, Enum):
+    OPTIMAL = "OPTIMAL"
+    MISSED_GAME = "MISSED GAME"
+    OVERBID = "OVERBID"
+    WRONG_OPENER = "WRONG OPENER"
+    WRONG_CONTRACT = "WRONG CONTRACT"
+
+class BidExplanation(BaseModel):
+    bid: str
+    explanation: str
+
+class BasicSection(BaseModel):
+    analysis: str
+    recommended_auction: List[BidExplanation]
+
+class AdvancedSection(BaseModel):
+    analysis: str
+    sequence: List[BidExplanation]
+
+class CoachNote(BaseModel):
+    player: str
+    topic: str
+    category: str
+
+class AnalysisResponse(BaseModel):
+    verdict: Verdict
+    actual_critique: List[str]
+    basic_section: BasicSection
+    advanced_section: AdvancedSection
+    coaches_corner: List[CoachNote]
@@ -0,0 +1,43 @@
+import time
+import asyncio
+import threading
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by every Gemini call in the process.
+    Callers only wait when the requests-per-minute budget is actually spent,
+    instead of sleeping a fixed amount after every request.
+    Works from worker threads (acquire) and from the event loop (acquire_async).
+    """
+
+    def __init__(self, requests_per_minute: int, burst: int = None):
+        self.rate = requests_per_minute / 60.0  # tokens per second
+        # Default burst is ~5 seconds of budget, not a whole minute: a full bucket plus
+        # a minute of refill would let ~2x RPM through in the first 60 s (429s)
+        self.capacity = burst if burst is not None else max(1, requests_per_minute // 12)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes one token and returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # Tokens may go negative: that queues callers in arrival order
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
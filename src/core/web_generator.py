@@ -7,6 +7,9 @@ from jinja2 import Environment, FileSystemLoader
 
 # --- CONFIGURATION SECTION ---
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+_BOARD_NUM_RE = re.compile(r'\d+')
+# Declarer letter (already upper-cased) -> seat name
+_DECLARER_NAMES = {'N': 'North', 'S': 'South', 'E': 'East', 'W': 'West'}
 WEB_CONFIG = {
     "input_folder": ROOT_DIR / "data/session_results",
     "output_folder": ROOT_DIR / "docs",
@@ -26,16 +29,18 @@ class WebGenerator:
 
     def generate_all(self):
         print(f"📂 Scanning for JSON in: {self.in_dir}")
-        files = [f for f in os.listdir(self.in_dir) if f.endswith(".json")]
-        if not files:
+        with os.scandir(self.in_dir) as it:
+            entries = [e for e in it if e.name.endswith(".json") and e.is_file()]
+        if not entries:
             print("⚠️  No JSON files found!")
             return
 
         hands_data = []
         
-        for f in files:
+        for entry in entries:
+            f = entry.name
             try:
-                with open(os.path.join(self.in_dir, f), 'r', encoding='utf-8') as json_file:
+                with open(entry.path, 'r', encoding='utf-8') as json_file:
                     data = json.load(json_file)
                     if 'ai_analysis' not in data: data['ai_analysis'] = {}
                     
@@ -44,13 +49,9 @@ class WebGenerator:
                     # --- FIX 1: DECLARER MAPPING ---
                     # Handles uppercase, lowercase, and missing data
                     raw_dec = facts.get('declarer', '')
-                    dec_map = {
-                        'N': 'North', 'S': 'South', 'E': 'East', 'W': 'West',
-                        'n': 'North', 's': 'South', 'e': 'East', 'w': 'West',
-                    }
                     # Default to 'Unknown' if key is missing or empty
-                    if raw_dec and str(raw_dec).upper() in dec_map:
-                        facts['declarer_full'] = dec_map[str(raw_dec).upper()]
+                    if raw_dec and str(raw_dec).upper() in _DECLARER_NAMES:
+                        facts['declarer_full'] = _DECLARER_NAMES[str(raw_dec).upper()]
                     else:
                         facts['declarer_full'] = "Unknown"
 
@@ -85,8 +86,8 @@ class WebGenerator:
         # Sort by board number
         def get_board_num(item):
             board_str = item.get('facts', {}).get('board', '0')
-            nums = re.findall(r'\d+', board_str)
-            return int(nums[0]) if nums else 0
+            num = _BOARD_NUM_RE.search(board_str)
+            return int(num.group(0)) if num else 0
 
         hands_data.sort(key=get_board_num)
         
@@ -1,4 +1,4 @@
-import json
+import orjson
 from pathlib import Path
 from PyQt6.QtWidgets import (QMainWindow, QTableView, QVBoxLayout, 
                              QWidget, QHeaderView, QMessageBox, QFileDialog,
@@ -16,7 +16,11 @@ from src.core.parsers import BridgeParser
 from src.core.bridge_math import BridgeMath
 from src.core.database import DatabaseManager
 from src.core.handviewer import HandViewer
-from src.core.ai_orchestrator import AIOrchestrator  # <--- NEW IMPORT
+from src.core.ai_orchestrator import get_orchestrator  # <--- NEW IMPORT
+
+# Imports of at least this many changed files load without the secondary indexes and
+# rebuild them once at the end; smaller imports just insert into the indexed tables.
+BULK_IMPORT_MIN_FILES = 20
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -27,7 +31,7 @@ class MainWindow(QMainWindow):
         
         # Initialize AI Orchestrator (Lazy load or init here)
         try:
-            self.ai_orchestrator = AIOrchestrator()
+            self.ai_orchestrator = get_orchestrator()
             self.ai_enabled = True
         except Exception as e:
             logger.error(f"AI Disabled: {e}")
@@ -175,7 +179,7 @@ class MainWindow(QMainWindow):
             "board_id": get_val("deal_id"), # Using deal_id as proxy for board info
             "dealer": get_val("dealer"),
             "vulnerability": get_val("vulnerability"),
-            "hands": json.loads(hands_json),
+            "hands": orjson.loads(hands_json),
             # We could fetch auction from 'sessions' table here if we did a JOIN in the model,
             # but for now we send the cards.
             "auction": [] 
@@ -264,10 +268,35 @@ class MainWindow(QMainWindow):
         
         count = 0
         self.backend_db.connect()
+        bulk_load = False
         try:
+            pending = []
             for f_path in file_paths:
                 path_obj = Path(f_path)
-                deals = BridgeParser.parse_file(path_obj)
+                # Unchanged since the last import: nothing to parse or insert
+                signature = self.backend_db.file_signature(path_obj)
+                if self.backend_db.is_imported(path_obj, signature):
+                    logger.info(f"Skipping unchanged file: {path_obj.name}")
+                    count += 1
+                    self.progress_bar.setValue(count)
+                    continue
+                pending.append((path_obj, signature))
+
+            # Large load: drop the secondary indexes and rebuild them once at the end
+            if len(pending) >= BULK_IMPORT_MIN_FILES:
+                self.backend_db.drop_indexes()
+                bulk_load = True
+
+            # File reads overlap on a thread pool; parsing and inserts stay here, in order
+            parsed = BridgeParser.parse_files(p for p, _ in pending)
+            for (path_obj, signature), (_, deals) in zip(pending, parsed):
+                if not deals:
+                    # Unreadable or nothing parsed: leave it unrecorded so the next import retries it
+                    logger.warning(f"No deals imported from {path_obj.name}")
+                    count += 1
+                    self.progress_bar.setValue(count)
+                    continue
+                rows = []
                 for hand_data in deals:
                     math_results = {}
                     for direction, cards in hand_data['hands'].items():
@@ -276,7 +305,9 @@ class MainWindow(QMainWindow):
                     # Generate URL
                     hv_url = HandViewer.generate_url(hand_data)
                     
-                    self.backend_db.save_deal(hand_data, math_results, hv_url)
+                    rows.append((hand_data, math_results, hv_url))
+                # One transaction per file (deals, sessions and its file_cache row together)
+                self.backend_db.save_deals_bulk(rows, source=(path_obj, signature))
                 count += 1
                 self.progress_bar.setValue(count)
             QMessageBox.information(self, "Success", f"Processed {count} files.")
@@ -284,6 +315,8 @@ class MainWindow(QMainWindow):
             logger.error(f"Import failed: {e}")
             QMessageBox.critical(self, "Import Error", str(e))
         finally:
+            if bulk_load:
+                self.backend_db.create_indexes()
             self.backend_db.close()
             self.progress_bar.setVisible(False)
             self.model.select()
@@ -291,4 +324,6 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         if self.db.isOpen():
             self.db.close()
+        if self.ai_enabled:
+            self.ai_orchestrator.close()
         event.accept()
\ No newline at end of file
@@ -6,11 +6,15 @@ def setup_logger():
     """Configures the logging format and file outputs."""
     logger.remove() # Remove default handler
     
+    # enqueue=True: formatting + I/O happen on loguru's background worker,
+    # so logging in hot loops (and from worker threads) never blocks on the sink.
+    
     # Console Handler (Colorized, concise)
     logger.add(
         sys.stderr, 
         format="<green>{module}:{function}:{line}{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>", 
-        level="INFO"
+        level="INFO",
+        enqueue=True
     )
     
     # File Handler (Detailed, rotation every 1 MB)
@@ -20,7 +24,8 @@ def setup_logger():
         rotation="1 MB", 
         retention="10 days", 
         level="DEBUG",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {module}:{function}:{line} - {message}"
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {module}:{function}:{line} - {message}",
+        enqueue=True
     )
 
     return logger
\ No newline at end of file
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Tests import the app the way main.py does: `from src.core... import ...`
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
@@ -0,0 +1,28 @@
+import asyncio
+import shelve
+import threading
+from collections import OrderedDict
+
+from src.core.ai_orchestrator import AIOrchestrator
+
+
+def _orchestrator(tmp_path):
+    orchestrator = AIOrchestrator.__new__(AIOrchestrator)  # no Gemini client needed
+    orchestrator._cache = shelve.open(str(tmp_path / "ai_cache"))
+    orchestrator._cache_lock = threading.Lock()
+    orchestrator._memo = OrderedDict()
+    return orchestrator
+
+
+def test_group_put_is_flushed_to_disk_on_close(tmp_path):
+    orchestrator = _orchestrator(tmp_path)
+    items = [("k1", {"verdict": "OPTIMAL"}), ("k2", {"verdict": "OVERBID"})]
+    # As the async paths call it: off the event loop
+    asyncio.run(asyncio.to_thread(orchestrator._cache_put_many, items))
+    orchestrator._memo.clear()
+    assert orchestrator._cache_get("k2") == {"verdict": "OVERBID"}
+    orchestrator.close()
+    orchestrator.close()  # idempotent
+
+    with shelve.open(str(tmp_path / "ai_cache")) as reopened:
+        assert dict(reopened) == dict(items)
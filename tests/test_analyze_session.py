@@ -0,0 +1,38 @@
+import asyncio
+
+import analyze_session
+
+BOARD = "4571390341.lin"
+
+
+class _Engine:
+    def __init__(self, analysis):
+        self.analysis = analysis
+
+    async def analyze_hand_async(self, hand_data, math_results, dds_data):
+        return self.analysis
+
+
+class _Writer:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, path, obj):
+        self.submitted.append((path, obj))
+
+
+def _process(analysis):
+    writer = _Writer()
+    path = analyze_session.os.path.join(analyze_session.RAW_DATA_DIR, BOARD)
+    # cpu_pool=None: the default thread pool is enough for one board without DDS
+    asyncio.run(analyze_session.process_file(BOARD, path, None, asyncio.Semaphore(1), _Engine(analysis), writer, False))
+    return writer.submitted
+
+
+def test_successful_analysis_is_saved():
+    submitted = _process({"verdict": "OPTIMAL"})
+    assert [path for path, _ in submitted] == [analyze_session.os.path.join(analyze_session.RESULTS_DIR, "4571390341.json")]
+
+
+def test_failed_analysis_is_not_saved_so_the_board_is_retried():
+    assert _process({"error": "429 RESOURCE_EXHAUSTED"}) == []
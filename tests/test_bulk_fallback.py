@@ -0,0 +1,34 @@
+import asyncio
+
+from src.core.ai_orchestrator import AIOrchestrator
+from src.core.rate_limiter import TokenBucket
+
+
+class _Tracking(AIOrchestrator):
+    """No client: every bulk request fails, and the per-deal retry just records concurrency."""
+
+    def __init__(self):
+        self.client = None
+        self._limiter = TokenBucket(6000, burst=100)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def analyze_hand_async(self, hand_data, math_results, dds_data=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {"verdict": "OPTIMAL"}
+
+
+def test_per_deal_retry_of_a_failed_group_respects_the_semaphore():
+    orchestrator = _Tracking()
+    group = [(i, ({"board": f"Board {i}"}, {}, None), f"key{i}", "{}") for i in range(10)]
+
+    async def run():
+        sem = asyncio.Semaphore(2)
+        return await orchestrator._analyze_group(group, sem)
+
+    results = asyncio.run(run())
+    assert results == [{"verdict": "OPTIMAL"}] * 10
+    assert orchestrator.peak <= 2
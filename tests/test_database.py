@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+from src.core.database import DatabaseManager
+
+
+def _tables(db):
+    return {row[0] for row in db.connection.execute("SELECT name FROM sqlite_master")}
+
+
+def test_init_schema_creates_indexes_without_analyze(tmp_path):
+    db = DatabaseManager(tmp_path / "bridge.db")
+    db.init_schema()
+    names = _tables(db)
+    assert {name for name, _ in DatabaseManager.SECONDARY_INDEXES} <= names
+    # ANALYZE writes sqlite_stat1; a plain launch must not pay for a full-table scan
+    assert "sqlite_stat1" not in names
+    db.close()
+
+
+def test_index_rebuild_after_bulk_load_analyzes(tmp_path):
+    db = DatabaseManager(tmp_path / "bridge.db")
+    db.init_schema()
+    db.drop_indexes()
+    assert not {name for name, _ in DatabaseManager.SECONDARY_INDEXES} & _tables(db)
+    db.create_indexes()
+    names = _tables(db)
+    assert {name for name, _ in DatabaseManager.SECONDARY_INDEXES} <= names
+    assert "sqlite_stat1" in names
+    db.close()
+
+
+def _deal(source_file):
+    hands = {"North": ["AKQJ", "AKQ", "AKQ", "AKQ"], "East": ["T987", "JT9", "JT9", "JT9"],
+             "South": ["6543", "876", "876", "876"], "West": ["2", "5432", "5432", "5432"]}
+    return ({"source_file": source_file, "hands": hands}, {}, "")
+
+
+def test_file_is_recorded_in_the_same_transaction_as_its_deals(tmp_path):
+    source = tmp_path / "session.lin"
+    source.write_text("qx|o1|md|1...|")
+    signature = DatabaseManager.file_signature(source)
+    db = DatabaseManager(tmp_path / "bridge.db")
+    db.init_schema()
+
+    # A failing insert must not leave the file marked as imported
+    db.connection.execute("CREATE TRIGGER no_sessions BEFORE INSERT ON sessions BEGIN SELECT RAISE(ABORT, 'boom'); END")
+    with pytest.raises(sqlite3.Error):
+        db.save_deals_bulk([_deal(source.name)], source=(source, signature))
+    assert not db.is_imported(source, signature)
+
+    db.connection.execute("DROP TRIGGER no_sessions")
+    deal_ids = db.save_deals_bulk([_deal(source.name)], source=(source, signature))
+    assert db.is_imported(source, signature)
+    assert len(deal_ids) == 1
+    db.close()
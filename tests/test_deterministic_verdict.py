@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("endplay")
+
+from src.core.bridge_solver import BridgeSolver
+from src.core.ai_orchestrator import AIOrchestrator
+
+SEATS = ('North', 'East', 'South', 'West')
+
+# Every hand 10 HCP, longest suit 5; DDS gives N/S 10 tricks in spades (4S makes)
+SPADE_GAME = "N:92.Q6.KQ532.K652 QJT84.AK872.76.8 A765.93.T84.AQ74 K3.JT54.AJ9.JT93"
+# Every hand 10 HCP, longest suit 5; no game in any strain for either side
+NO_GAME = "N:J4.JT95.A98.AT95 KT93.A.J732.Q742 Q762.K76.KQT65.8 A85.Q8432.4.KJ63"
+
+
+def _passed_out(pbn, with_dds=True):
+    hand_data = {"dealer": "North", "contract": "Pass", "auction": ["p", "p", "p", "p"]}
+    math_results = {
+        seat: {"hcp": 10, "distribution": "=".join(str(len(suit)) for suit in hand.split('.'))}
+        for seat, hand in zip(SEATS, pbn[2:].split(' '))
+    }
+    dds_data = BridgeSolver().solve(None, pbn) if with_dds else None
+    orchestrator = AIOrchestrator.__new__(AIOrchestrator)  # no Gemini client needed
+    return orchestrator._try_deterministic_verdict(hand_data, math_results, dds_data)
+
+
+def test_pass_out_with_a_makeable_major_game_goes_to_gemini():
+    assert _passed_out(SPADE_GAME) is None
+
+
+def test_pass_out_with_no_game_is_answered_locally():
+    result = _passed_out(NO_GAME)
+    assert result['verdict'] == "OPTIMAL"
+    assert [b['bid'] for b in result['basic_section']['recommended_auction']] == ["Pass"] * 4
+
+
+def test_pass_out_without_dds_goes_to_gemini():
+    # Without a DDS table "no game makes" is unknown, even for a deal where it holds
+    assert _passed_out(NO_GAME, with_dds=False) is None
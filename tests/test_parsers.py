@@ -0,0 +1,18 @@
+from src.utils.paths import DATA_DIR
+from src.core.parsers import BridgeParser
+
+SESSION_RAW = DATA_DIR / "session_raw"
+
+
+def test_parse_files_matches_parse_file_in_input_order():
+    paths = sorted(SESSION_RAW.glob("*.lin"))
+    # workers=1 keeps a window of two reads, so most files go through the refill path
+    results = list(BridgeParser.parse_files(paths, workers=1))
+    assert [path for path, _ in results] == paths
+    assert [deals for _, deals in results] == [BridgeParser.parse_file(path) for path in paths]
+
+
+def test_missing_hand_is_deduced():
+    for _, deals in BridgeParser.parse_files(sorted(SESSION_RAW.glob("*.lin"))):
+        for deal in deals:
+            assert [len("".join(hand)) for hand in deal['hands'].values()] == [13, 13, 13, 13]
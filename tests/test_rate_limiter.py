@@ -0,0 +1,19 @@
+from src.core.rate_limiter import TokenBucket
+
+
+def _granted_within(bucket, seconds, calls):
+    # Every call arrives at once: the k-th one is told to wait (k - burst) / rate
+    return sum(1 for _ in range(calls) if bucket._reserve() <= seconds)
+
+
+def test_cold_start_stays_within_one_minute_budget():
+    rpm = 60
+    bucket = TokenBucket(rpm)
+    granted = _granted_within(bucket, 60.0, 3 * rpm)
+    assert granted <= rpm + bucket.capacity
+    assert bucket.capacity <= rpm // 10
+
+
+def test_explicit_burst_is_honoured():
+    bucket = TokenBucket(60, burst=3)
+    assert _granted_within(bucket, 0.0, 10) == 3
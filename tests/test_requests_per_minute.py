@@ -0,0 +1,19 @@
+import pytest
+
+from src.core.ai_orchestrator import AI_CONFIG, _requests_per_minute
+
+
+@pytest.mark.parametrize("value", ["abc", "1.5", "0", "-3", ""])
+def test_invalid_gemini_rpm_falls_back_to_the_default(monkeypatch, value):
+    monkeypatch.setenv("GEMINI_RPM", value)
+    assert _requests_per_minute() == AI_CONFIG["requests_per_minute"]
+
+
+def test_valid_gemini_rpm_is_used(monkeypatch):
+    monkeypatch.setenv("GEMINI_RPM", " 500 ")
+    assert _requests_per_minute() == 500
+
+
+def test_unset_gemini_rpm_uses_the_default(monkeypatch):
+    monkeypatch.delenv("GEMINI_RPM", raising=False)
+    assert _requests_per_minute() == AI_CONFIG["requests_per_minute"]
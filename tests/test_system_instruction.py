@@ -0,0 +1,24 @@
+from src.core.ai_orchestrator import AIOrchestrator
+from src.core.prompts import SYSTEM_INSTRUCTION, SYSTEM_INSTRUCTION_PASSOUT
+
+
+def test_passed_out_auction_gets_the_passout_instruction():
+    hand_data = {"contract": "Pass", "auction": ["p", "p", "p", "p"]}
+    assert AIOrchestrator._system_instruction(hand_data) is SYSTEM_INSTRUCTION_PASSOUT
+
+
+def test_played_contract_gets_the_full_instruction():
+    hand_data = {"contract": "4S", "auction": ["1S", "p", "4S", "p", "p", "p"]}
+    assert AIOrchestrator._system_instruction(hand_data) is SYSTEM_INSTRUCTION
+
+
+def test_deal_without_contract_is_not_treated_as_passed_out():
+    # BridgeParser (GUI import) deals carry an auction but no 'contract' key
+    hand_data = {"auction": ["1S", "p", "4S", "p", "p", "p"]}
+    assert AIOrchestrator._system_instruction(hand_data) is SYSTEM_INSTRUCTION
+
+
+def test_deal_without_auction_is_not_treated_as_passed_out():
+    # LINParser reports 'Pass' when the record has no bids at all
+    hand_data = {"contract": "Pass", "auction": []}
+    assert AIOrchestrator._system_instruction(hand_data) is SYSTEM_INSTRUCTION